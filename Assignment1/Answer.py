@@ -1,6 +1,12 @@
 import itertools
+import os
+import sys
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maxsat.counting import count_models, iter_models
+
 def read_dimacs_file(filename):
     """Reads a DIMACS file and returns the number of variables, clauses, and clause list.
 
@@ -40,49 +46,29 @@ def read_dimacs_file(filename):
 
     return num_vars, num_clauses, clauses
 
-def find_satisfying_assignments(num_vars, clauses):
-    """Finds all satisfying assignments for a given set of clauses.
+def find_satisfying_assignments(num_vars, clauses, limit=10):
+    """Counts the satisfying assignments of a set of clauses and lists the first few.
+
+    The count is exact (see `maxsat.counting`); the models are enumerated
+    lazily, so only `limit` of them are ever held.
 
     Args:
         num_vars: The number of variables.
         clauses: A list of clauses.
+        limit: The most satisfying assignments to return; None for all.
 
     Returns:
-        A list of satisfying assignments.
+        A tuple of the first satisfying assignments (tuples of bools, in the
+        order of a brute-force enumeration) and the number of them.
     """
 
-    best_assignments = []
-    satisfied_assignment_count = 0
-
-    # Generate all possible truth assignments for the variables
-    for assignment in itertools.product([False, True], repeat=num_vars):
-        satisfied_clauses = 0
-
-        # Evaluate the current assignment
-        for clause in clauses:
-            satisfied = False
-            for literal in clause:
-                var = abs(literal)
-                is_true = assignment[var - 1]
-
-                if (literal > 0 and is_true) or (literal < 0 and not is_true):
-                    satisfied = True
-                    break
-
-            if satisfied:
-                satisfied_clauses += 1
-            else:
-                break
-
-        # If all clauses are satisfied by this assignment
-        if satisfied_clauses == len(clauses):
-            satisfied_assignment_count += 1
-            best_assignments.append(assignment)
+    best_assignments = list(itertools.islice(iter_models(num_vars, clauses), limit))
+    satisfied_assignment_count = count_models(num_vars, clauses)
 
     return best_assignments, satisfied_assignment_count
 
 def main():
-    filename = 'hoos.cnf'
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'hoos.cnf'
     num_vars, num_clauses, clauses = read_dimacs_file(filename)
 
     start_time = time.time()
@@ -96,7 +82,7 @@ def main():
     print(f"Number of satisfying assignments: {satisfied_assignment_count}")
 
     if satisfied_assignment_count > 0:
-        print("Best assignments:")
+        print(f"First {len(best_assignments)} best assignments:")
         for i, assignment in enumerate(best_assignments, start=1):
             print(f"No {i} best assignment: {', '.join(map(str, assignment))}")
     else:
@@ -105,4 +91,4 @@ def main():
     print(f"Execution time: {execution_time:.6f} seconds")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,236 @@
+"""Micro-benchmarks of the evaluation kernels, checked against a reference oracle.
+
+Every implementation of a kernel is first run on --checks random assignments
+(and random flips) of every instance and compared with the pure-Python
+reference, `maxsat.fitness.evaluate_fitness`; only then is it timed. Kernels:
+
+    parse   read_dimacs, Assignment 1's read_dimacs_file, load_compiled
+    eval    full evaluation: evaluate_fitness, evaluate_compiled, the GA's
+            check_all and OffspringEvaluator, FlipState
+    delta   fitness change of one flip: FlipState.score, FlipState.flip,
+            OffspringEvaluator.derive
+    scan    all n flip deltas: FlipState and WeightedFlipState scores, the
+            best score of ScoreBuckets
+    batch   fitness of a (K, n) array of assignments: the batched walkers'
+            true counts, evaluate_compiled per row
+
+The instances are random 3-SAT at --ratio clauses per variable plus a few
+clauses with repeated literals and tautologies, which some kernels normalise
+away. One CSV row is printed per kernel and size, with the operations per
+second and the peak bytes allocated by one operation (tracemalloc):
+
+    python benchmarks/kernels.py --sizes 20 100 250 1000 > kernels.csv
+
+The exit status is 1 if any kernel disagrees with the oracle.
+"""
+import argparse
+import csv
+import importlib.util
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maxsat.algorithms.batched import _true_counts
+from maxsat.algorithms.clause_weighting import WeightedFlipState
+from maxsat.algorithms.genetic import OffspringEvaluator, check_all
+from maxsat.buckets import buckets_for
+from maxsat.compiled import compile_clauses, decompile, evaluate_compiled, load_compiled, save_compiled
+from maxsat.dimacs import read_dimacs, write_dimacs
+from maxsat.fitness import evaluate_fitness
+from maxsat.generator import random_ksat
+from maxsat.incremental import FlipState, normalise_clauses
+from timing import rate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _assignment1():
+    spec = importlib.util.spec_from_file_location('answer', os.path.join(ROOT, 'Assignment1', 'Answer.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_instance(num_vars, ratio, seed, directory):
+    """Returns a random instance with a few awkward clauses, saved as DIMACS and compiled."""
+    clauses = random_ksat(num_vars, round(ratio * num_vars), 3, seed).tolist()
+    clauses += [[1, -1, 2], [2, 2, -3], [-3, -3], [num_vars, -num_vars]]
+    instance = {'num_vars': num_vars, 'clauses': clauses,
+                'dimacs': os.path.join(directory, f"kernels-{num_vars}.cnf"),
+                'compiled': os.path.join(directory, f"kernels-{num_vars}.npz")}
+    write_dimacs(instance['dimacs'], num_vars, clauses)
+    instance['literals'], instance['offsets'] = compile_clauses(clauses)
+    save_compiled(instance['compiled'], num_vars, instance['literals'], instance['offsets'])
+    return instance
+
+
+def oracle_deltas(solution, clauses):
+    """Returns the fitness change of flipping each variable, by full re-evaluation."""
+    fitness = evaluate_fitness(solution, clauses)
+    deltas = []
+    for var in range(len(solution)):
+        solution[var] ^= 1
+        deltas.append(evaluate_fitness(solution, clauses) - fitness)
+        solution[var] ^= 1
+    return deltas
+
+
+def as_literals(solution):
+    return [var + 1 if value else -(var + 1) for var, value in enumerate(solution)]
+
+
+def kernels(instance, answer):
+    """Returns (category, name, prepare, operation, check) for every kernel.
+
+    `prepare(solution, var, rows)` builds the inputs of one operation from an
+    assignment, a variable and a (K, n) batch; `operation(inputs)` is what is
+    timed; `check(solution, var, rows, result)` returns the oracle's answer
+    and the kernel's, which must be equal.
+    """
+    num_vars = instance['num_vars']
+    clauses = instance['clauses']
+    literals = instance['literals']
+    offsets = instance['offsets']
+    normalised, tautologies = normalise_clauses(clauses)
+    normalised_literals, normalised_offsets = compile_clauses(normalised)
+    evaluator = OffspringEvaluator(clauses, num_vars)
+
+    def fitness(solution, var, rows, result):
+        return evaluate_fitness(solution, clauses), result
+
+    def delta(solution, var, rows, result):
+        flipped = list(solution)
+        flipped[var] ^= 1
+        return evaluate_fitness(flipped, clauses) - evaluate_fitness(solution, clauses), result
+
+    def scan(solution, var, rows, result):
+        return oracle_deltas(list(solution), clauses), result
+
+    def batch(solution, var, rows, result):
+        return [evaluate_fitness(row, clauses) for row in rows.tolist()], result
+
+    def flip_twice(state, var):
+        before = state.fitness
+        state.flip(var)
+        after = state.fitness
+        state.flip(var)
+        return after - before
+
+    def derive(inputs):
+        state, individual, var = inputs
+        return state[1] - evaluator.derive(state, individual, (var,))[1]
+
+    def derive_inputs(solution, var, rows):
+        flipped = list(solution)
+        flipped[var] ^= 1
+        return evaluator.evaluate(as_literals(solution)), as_literals(flipped), var
+
+    def batch_counts(rows):
+        counts = _true_counts(rows, normalised_literals, normalised_offsets)
+        return ((counts[:, :-1] > 0).sum(axis=1) + tautologies).tolist()
+
+    return [
+        ('parse', 'read_dimacs', lambda *_: instance['dimacs'],
+         lambda path: read_dimacs(path)[1],
+         lambda solution, var, rows, result: (clauses, result)),
+        ('parse', 'assignment1_read_dimacs_file', lambda *_: instance['dimacs'],
+         lambda path: answer.read_dimacs_file(path)[2],
+         lambda solution, var, rows, result: (clauses, result)),
+        ('parse', 'load_compiled', lambda *_: instance['compiled'],
+         lambda path: decompile(*load_compiled(path)[1:]),
+         lambda solution, var, rows, result: (clauses, result)),
+
+        ('eval', 'evaluate_fitness', lambda solution, var, rows: solution,
+         lambda solution: evaluate_fitness(solution, clauses), fitness),
+        ('eval', 'evaluate_compiled', lambda solution, var, rows: np.array(solution, dtype=np.uint8),
+         lambda solution: evaluate_compiled(solution, literals, offsets), fitness),
+        ('eval', 'check_all', lambda solution, var, rows: as_literals(solution),
+         lambda individual: len(clauses) - check_all(clauses, individual), fitness),
+        ('eval', 'offspring_evaluate', lambda solution, var, rows: as_literals(solution),
+         lambda individual: len(clauses) - evaluator.evaluate(individual)[1], fitness),
+        ('eval', 'flipstate', lambda solution, var, rows: solution,
+         lambda solution: FlipState(clauses, num_vars, solution).fitness, fitness),
+
+        ('delta', 'flipstate_score', lambda solution, var, rows: (FlipState(clauses, num_vars, solution), var),
+         lambda inputs: inputs[0].score(inputs[1]), delta),
+        ('delta', 'flipstate_flip', lambda solution, var, rows: (FlipState(clauses, num_vars, solution), var),
+         lambda inputs: flip_twice(*inputs), delta),
+        ('delta', 'offspring_derive', derive_inputs, derive, delta),
+
+        ('scan', 'flipstate_scores', lambda solution, var, rows: FlipState(clauses, num_vars, solution),
+         lambda state: [state.score(v) for v in range(num_vars)], scan),
+        ('scan', 'weighted_flipstate_scores', lambda solution, var, rows: WeightedFlipState(clauses, num_vars, solution),
+         lambda state: [state.score(v) for v in range(num_vars)], scan),
+        ('scan', 'score_buckets_best', lambda solution, var, rows: FlipState(clauses, num_vars, solution),
+         lambda state: buckets_for(state).best_score(),
+         lambda solution, var, rows, result: (max(oracle_deltas(list(solution), clauses)), result)),
+
+        ('batch', 'batched_true_counts', lambda solution, var, rows: rows, batch_counts, batch),
+        ('batch', 'evaluate_compiled_rows', lambda solution, var, rows: rows,
+         lambda rows: [evaluate_compiled(row, literals, offsets) for row in rows], batch),
+    ]
+
+
+def peak_allocation(operation, inputs):
+    """Returns the peak bytes allocated while operation(inputs) runs once."""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        operation(inputs)
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 100, 250, 1000], help="variable counts")
+    parser.add_argument('--ratio', type=float, default=4.26, help="clauses per variable")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--checks', type=int, default=20, help="random assignments checked per kernel and size")
+    parser.add_argument('--batch', type=int, default=64, help="assignments per batch operation")
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds spent per rate measurement")
+    parser.add_argument('--kernel', action='append', metavar='NAME',
+                        help="only run kernels of this name or category (repeatable)")
+    args = parser.parse_args(argv)
+
+    answer = _assignment1()
+    rng = np.random.default_rng(args.seed)
+    writer = csv.writer(sys.stdout)
+    writer.writerow(['category', 'kernel', 'num_vars', 'num_clauses', 'ops_per_s', 'peak_alloc_b', 'checks'])
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for num_vars in args.sizes:
+            instance = make_instance(num_vars, args.ratio, args.seed, directory)
+            for category, name, prepare, operation, check in kernels(instance, answer):
+                if args.kernel and category not in args.kernel and name not in args.kernel:
+                    continue
+                for _ in range(args.checks):
+                    solution = rng.integers(0, 2, size=num_vars, dtype=np.uint8).tolist()
+                    var = int(rng.integers(num_vars))
+                    rows = rng.integers(0, 2, size=(args.batch, num_vars), dtype=np.uint8)
+                    expected, result = check(solution, var, rows, operation(prepare(solution, var, rows)))
+                    if expected != result:
+                        mismatches += 1
+                        print(f"{name} on {num_vars} variables: expected {str(expected)[:80]}, got {str(result)[:80]}",
+                              file=sys.stderr)
+                        break
+
+                solution = rng.integers(0, 2, size=num_vars, dtype=np.uint8).tolist()
+                rows = rng.integers(0, 2, size=(args.batch, num_vars), dtype=np.uint8)
+                inputs = prepare(solution, int(rng.integers(num_vars)), rows)
+                writer.writerow([category, name, num_vars, len(instance['clauses']),
+                                 f"{rate(operation, args.min_time, inputs):.1f}", peak_allocation(operation, inputs),
+                                 args.checks])
+                sys.stdout.flush()
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Effect of locality reordering on evaluation throughput.
+
+For every size two 3-SAT instances are generated at --ratio clauses per
+variable:
+
+    random    uniform random (like the uf* files): no structure to recover
+    banded    every clause draws its variables from a window of --window
+              neighbouring variables, then variables and clauses are shuffled,
+              like an industrial instance written in an arbitrary order
+
+Each is compiled, timed, reordered with `maxsat.reorder.reorder` and timed
+again (the evaluations are checked to agree) with two kernels:
+
+    evals_per_s   `maxsat.compiled.evaluate_compiled` on one assignment
+    batch_evals_per_s
+                  --batch assignments at once, stored variable-major so every
+                  literal gathers a whole row; a population or walker batch
+
+The single-assignment kernel mostly streams the literal array, and its
+assignment (one byte per variable) stays in L2 up to about a million
+variables, so it gains little. The batch kernel gathers --batch bytes per
+literal from an array well beyond L2, which is where locality pays off. One
+CSV row per instance:
+
+    python benchmarks/reorder.py --sizes 10000 100000 1000000 > reorder.csv
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maxsat.compiled import compile_clauses, evaluate_compiled
+from maxsat.generator import random_ksat
+from maxsat.reorder import locality, reorder
+from timing import rate
+
+
+def banded_ksat(num_vars, num_clauses, window, k=3, seed=None):
+    """Generates a shuffled formula whose clauses each span `window` neighbouring variables."""
+    rng = np.random.default_rng(seed)
+    centres = rng.integers(0, num_vars, size=(num_clauses, 1))
+    offsets = rng.integers(0, window, size=(num_clauses, k))
+    while True:
+        ordered = np.sort(offsets, axis=1)
+        repeated = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+        if not len(repeated):
+            break
+        offsets[repeated] = rng.integers(0, window, size=(len(repeated), k))
+    variables = (centres + offsets) % num_vars
+    shuffled = rng.permutation(num_vars)[variables] + 1
+    signs = rng.integers(0, 2, size=(num_clauses, k)) * 2 - 1
+    return (shuffled * signs)[rng.permutation(num_clauses)].astype(np.int32)
+
+
+def batch_evaluator(literals, offsets):
+    """Returns a function evaluating a (num_vars, K) bool array of K assignments."""
+    variables = np.abs(literals) - 1
+    positive = (literals > 0)[:, None]
+    # Empty clauses are never satisfied; see `maxsat.compiled.evaluate_compiled`.
+    starts = offsets[:-1][offsets[:-1] < offsets[1:]]
+
+    def evaluate(solutions):
+        values = solutions[variables] == positive
+        return np.logical_or.reduceat(values, starts, axis=0).sum(axis=0)
+    return evaluate
+
+
+def measure(kind, num_vars, matrix, seed, min_time, batch):
+    clauses = matrix.tolist()
+    literals, offsets = compile_clauses(clauses)
+    start_time = time.perf_counter()
+    reordering = reorder(num_vars, clauses)
+    reorder_time = time.perf_counter() - start_time
+    new_literals, new_offsets = compile_clauses(reordering.clauses)
+
+    rng = np.random.default_rng(seed)
+    solution = rng.integers(0, 2, size=num_vars, dtype=np.uint8)
+    restored = np.array(reordering.reconstruct(solution), dtype=np.uint8)
+    if evaluate_compiled(solution, new_literals, new_offsets) != evaluate_compiled(restored, literals, offsets):
+        raise AssertionError(f"reordered {kind} instance with {num_vars} variables evaluates differently")
+
+    solutions = rng.integers(0, 2, size=(num_vars, batch), dtype=np.uint8).astype(bool)
+    restored_solutions = np.empty_like(solutions)
+    restored_solutions[np.array(reordering.variables) - 1] = solutions
+    original_batch = batch_evaluator(literals, offsets)
+    reordered_batch = batch_evaluator(new_literals, new_offsets)
+    if not np.array_equal(original_batch(restored_solutions), reordered_batch(solutions)):
+        raise AssertionError(f"reordered {kind} instance with {num_vars} variables evaluates differently")
+
+    before = locality(num_vars, clauses)
+    after = locality(reordering.num_vars, reordering.clauses)
+    original_rate = rate(lambda: evaluate_compiled(restored, literals, offsets), min_time)
+    reordered_rate = rate(lambda: evaluate_compiled(solution, new_literals, new_offsets), min_time)
+    original_batch_rate = batch * rate(lambda: original_batch(restored_solutions), min_time)
+    reordered_batch_rate = batch * rate(lambda: reordered_batch(solutions), min_time)
+    return {
+        'kind': kind,
+        'num_vars': num_vars,
+        'num_clauses': len(clauses),
+        'instance_mb': (literals.nbytes + offsets.nbytes + num_vars) / (1 << 20),
+        'span_before': before[0],
+        'span_after': after[0],
+        'jump_before': before[1],
+        'jump_after': after[1],
+        'reorder_s': reorder_time,
+        'evals_per_s_original': original_rate,
+        'evals_per_s_reordered': reordered_rate,
+        'speedup': reordered_rate / original_rate,
+        'batch_evals_per_s_original': original_batch_rate,
+        'batch_evals_per_s_reordered': reordered_batch_rate,
+        'batch_speedup': reordered_batch_rate / original_batch_rate,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--ratio', type=float, default=4.26, help="clauses per variable")
+    parser.add_argument('--window', type=int, default=50, help="variable window of a banded clause")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--min-time', type=float, default=1.0, help="seconds spent per rate measurement")
+    parser.add_argument('--batch', type=int, default=16, help="assignments per batch evaluation")
+    args = parser.parse_args(argv)
+
+    writer = None
+    for num_vars in args.sizes:
+        num_clauses = round(args.ratio * num_vars)
+        instances = [('random', random_ksat(num_vars, num_clauses, 3, args.seed)),
+                     ('banded', banded_ksat(num_vars, num_clauses, args.window, 3, args.seed))]
+        for kind, matrix in instances:
+            row = measure(kind, num_vars, matrix, args.seed, args.min_time, args.batch)
+            if writer is None:
+                writer = csv.DictWriter(sys.stdout, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Throughput against instance size on generated random 3-SAT instances.
+
+For every size a planted instance is generated, written as DIMACS and compiled
+form, read back, and evaluated on random assignments. Up to --ttt-limit
+variables, the chosen algorithm is also run until it satisfies every clause
+(time-to-target). One CSV row is printed per size so the results can be
+plotted directly:
+
+    python benchmarks/scaling.py --sizes 1000 10000 100000 1000000 > scaling.csv
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maxsat.algorithms import ALGORITHMS, get_algorithm
+from maxsat.cli import parse_param
+from maxsat.compiled import compile_matrix, evaluate_compiled, load_compiled, save_compiled
+from maxsat.dimacs import read_dimacs
+from maxsat.fitness import evaluate_fitness
+from maxsat.generator import planted_ksat, write_dimacs_matrix
+from maxsat.rng import RandomStreams
+from timing import rate
+
+
+def timed(function, *args):
+    start_time = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start_time
+
+
+def time_to_target(algorithm, clauses, num_vars, seed, runs, params):
+    """Returns the median time of the runs that satisfied every clause, and how many did."""
+    streams = RandomStreams(seed)
+    times = []
+    for run in range(runs):
+        result, elapsed = timed(lambda: algorithm(clauses, num_vars, streams.stream(run), **params))
+        if result['best_fitness'] == len(clauses):
+            times.append(elapsed)
+    return (float(np.median(times)) if times else ''), len(times)
+
+
+def measure(num_vars, ratio, seed, min_time, reference_limit, directory, algorithm, params, ttt_limit, runs):
+    num_clauses = round(ratio * num_vars)
+    (matrix, _), generate_time = timed(planted_ksat, num_vars, num_clauses, 3, seed)
+
+    dimacs_file = os.path.join(directory, f"planted-{num_vars}.cnf")
+    compiled_file = os.path.join(directory, f"planted-{num_vars}.npz")
+    _, write_dimacs_time = timed(write_dimacs_matrix, dimacs_file, num_vars, matrix)
+    literals, offsets = compile_matrix(matrix)
+    _, write_compiled_time = timed(save_compiled, compiled_file, num_vars, literals, offsets)
+    (_, clauses), parse_time = timed(read_dimacs, dimacs_file)
+    (_, literals, offsets), load_time = timed(load_compiled, compiled_file)
+
+    solution = np.random.default_rng(seed).integers(0, 2, size=num_vars, dtype=np.uint8)
+    row = {
+        'num_vars': num_vars,
+        'num_clauses': num_clauses,
+        'generate_s': generate_time,
+        'write_dimacs_s': write_dimacs_time,
+        'write_compiled_s': write_compiled_time,
+        'parse_dimacs_s': parse_time,
+        'load_compiled_s': load_time,
+        'evals_per_s_compiled': rate(lambda: evaluate_compiled(solution, literals, offsets), min_time),
+        'evals_per_s_reference': '',
+        'ttt_median_s': '',
+        'ttt_successes': '',
+    }
+    if num_clauses <= reference_limit:
+        solution_list = solution.tolist()
+        row['evals_per_s_reference'] = rate(lambda: evaluate_fitness(solution_list, clauses), min_time)
+    if num_vars <= ttt_limit:
+        row['ttt_median_s'], row['ttt_successes'] = time_to_target(algorithm, clauses, num_vars, seed, runs, params)
+
+    os.remove(dimacs_file)
+    os.remove(compiled_file)
+    return row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark throughput against instance size.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--ratio', type=float, default=4.26, help="clauses per variable")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--min-time', type=float, default=0.5, help="seconds spent per rate measurement")
+    parser.add_argument('--reference-limit', type=int, default=500000,
+                        help="largest clause count evaluated with the pure-Python reference")
+    parser.add_argument('--algorithm', choices=sorted(ALGORITHMS), default='msnahc',
+                        help="algorithm timed to the all-clauses target (default msnahc)")
+    parser.add_argument('-p', '--param', type=parse_param, action='append', default=[], metavar='NAME=VALUE',
+                        help="algorithm parameter, e.g. a smaller max_evaluations budget")
+    parser.add_argument('--ttt-limit', type=int, default=250, help="largest variable count timed to target")
+    parser.add_argument('--runs', type=int, default=10, help="time-to-target runs per size")
+    args = parser.parse_args(argv)
+    algorithm = get_algorithm(args.algorithm)
+
+    writer = None
+    with tempfile.TemporaryDirectory() as directory:
+        for num_vars in args.sizes:
+            row = measure(num_vars, args.ratio, args.seed, args.min_time, args.reference_limit, directory,
+                          algorithm, dict(args.param), args.ttt_limit, args.runs)
+            if writer is None:
+                writer = csv.DictWriter(sys.stdout, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Start-up cost of the package, of short runs and of worker processes.
+
+Every measurement runs in a fresh interpreter and the best of --repeat is
+reported, one CSV row each:
+
+    import        import maxsat.cli
+    list          python -m maxsat list
+    short_run     python -m maxsat run nahc on uf20-01 with one run
+    worker        spawn a one-process pool and get its first run back
+
+A plain run must not import the optional heavy modules (scipy,
+matplotlib); that and the --limit on each time are checked, and the exit
+status is 1 if any check fails, so the script can guard against start-up
+regressions:
+
+    python benchmarks/startup.py --limit 1.0
+"""
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INSTANCE = os.path.join(ROOT, "Assignment 2", "uf20-01.cnf")
+HEAVY_MODULES = ('scipy', 'matplotlib')
+
+WORKER = f"""
+import multiprocessing, time
+from concurrent.futures import ProcessPoolExecutor
+from maxsat.jobs import normalise_job, run_task
+job = normalise_job({{'algorithm': 'nahc', 'instance': {INSTANCE!r}, 'runs': 1, 'seed': 1}})
+start = time.perf_counter()
+with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as pool:
+    pool.submit(run_task, job, 0).result()
+print(time.perf_counter() - start)
+"""
+
+HEAVY = f"""
+import sys
+from maxsat.cli import main
+main(['run', 'nahc', {INSTANCE!r}, '--runs', '1', '--seed', '1'])
+print('heavy:' + ','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules), file=sys.stderr)
+"""
+
+
+def elapsed(arguments):
+    """Runs a command in the repository root and returns its wall time."""
+    start_time = time.perf_counter()
+    subprocess.run(arguments, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start_time
+
+
+def measurements():
+    python = sys.executable
+    return {
+        'import': lambda: elapsed([python, '-c', 'import maxsat.cli']),
+        'list': lambda: elapsed([python, '-m', 'maxsat', 'list']),
+        'short_run': lambda: elapsed([python, '-m', 'maxsat', 'run', 'nahc', INSTANCE, '--runs', '1', '--seed', '1']),
+        'worker': lambda: float(subprocess.run([python, '-c', WORKER], cwd=ROOT, check=True, capture_output=True,
+                                               text=True).stdout),
+    }
+
+
+def heavy_imports():
+    """Returns the heavy modules a plain run imported."""
+    result = subprocess.run([sys.executable, '-c', HEAVY], cwd=ROOT, check=True, capture_output=True, text=True)
+    line = [line for line in result.stderr.splitlines() if line.startswith('heavy:')][-1]
+    return [name for name in line[len('heavy:'):].split(',') if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help="fresh interpreters per measurement (default 5)")
+    parser.add_argument('--limit', type=float, help="fail if any best time exceeds this many seconds")
+    args = parser.parse_args()
+
+    failed = False
+    writer = csv.writer(sys.stdout)
+    writer.writerow(['measurement', 'best_s', 'median_s'])
+    for name, measure in measurements().items():
+        times = sorted(measure() for _ in range(args.repeat))
+        writer.writerow([name, f"{times[0]:.4f}", f"{times[len(times) // 2]:.4f}"])
+        if args.limit is not None and times[0] > args.limit:
+            print(f"{name}: {times[0]:.3f}s exceeds the limit of {args.limit}s", file=sys.stderr)
+            failed = True
+
+    heavy = heavy_imports()
+    if heavy:
+        print(f"a plain run imported {', '.join(heavy)}", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+"""Timing helpers shared by the benchmark scripts."""
+import time
+
+
+def rate(function, min_time, *args):
+    """Calls function(*args) repeatedly for at least min_time seconds; returns calls per second."""
+    calls = 0
+    start_time = time.perf_counter()
+    while True:
+        function(*args)
+        calls += 1
+        elapsed = time.perf_counter() - start_time
+        if elapsed >= min_time:
+            return calls / elapsed
@@ -0,0 +1 @@
+"""Shared building blocks for the MAXSAT metaheuristics in the assignment folders."""
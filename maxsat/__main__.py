@@ -0,0 +1,5 @@
+import sys
+
+from maxsat.cli import main
+
+sys.exit(main())
@@ -0,0 +1,44 @@
+"""Registry of the search algorithms runnable from the command line.
+
+Every entry names a ``run_*`` adapter with the signature
+``run(clauses, num_vars, rng, **params)``. Adapters return a dict with at
+least ``best_solution`` (0/1 list), ``best_fitness`` (satisfied clauses) and
+``evaluations``, and optionally ``total_evaluations`` and ``trace``. Their
+keyword defaults are the parameter values the assignment scripts used.
+Keyword-only arguments are hooks the job runner fills in (such as a shared
+elite pool, or a ``target`` fitness proven optimal, at which multistart
+searches stop), not tunable parameters.
+"""
+import importlib
+import inspect
+
+ALGORITHMS = {
+    'nahc': ('maxsat.algorithms.hillclimbing', 'run_nahc'),
+    'msnahc': ('maxsat.algorithms.hillclimbing', 'run_msnahc'),
+    'msnahc-batched': ('maxsat.algorithms.batched', 'run_msnahc_batched'),
+    'vna': ('maxsat.algorithms.hillclimbing', 'run_vna'),
+    'msvna': ('maxsat.algorithms.hillclimbing', 'run_msvna'),
+    'gsat': ('maxsat.algorithms.hillclimbing', 'run_gsat'),
+    'ga': ('maxsat.algorithms.genetic', 'run_ga'),
+    'tabu': ('maxsat.algorithms.tabu', 'run_tabu'),
+    'paws': ('maxsat.algorithms.clause_weighting', 'run_paws'),
+    'saps': ('maxsat.algorithms.clause_weighting', 'run_saps'),
+}
+
+
+def get_algorithm(name):
+    """Returns the adapter registered under `name`."""
+    if name not in ALGORITHMS:
+        raise KeyError(f"unknown algorithm {name!r}; choose from {', '.join(ALGORITHMS)}")
+    module_name, function_name = ALGORITHMS[name]
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def default_params(name):
+    """Returns the tunable parameters of an algorithm and their defaults."""
+    signature = inspect.signature(get_algorithm(name))
+    return {
+        param.name: param.default
+        for param in signature.parameters.values()
+        if param.default is not inspect.Parameter.empty and param.kind is not inspect.Parameter.KEYWORD_ONLY
+    }
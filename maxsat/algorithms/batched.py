@@ -0,0 +1,118 @@
+"""Lockstep batched multistart next ascent (MSNAHC over a walker array).
+
+K independent next-ascent walkers are advanced together: their assignments
+form a (K, n) array and their clause true-literal counts a (K, m) array. Each
+step every walker proposes the next variable of its own random visiting order,
+and the flip deltas of all K proposals are computed, accepted and applied with
+a handful of numpy operations through the padded occurrence matrix. A walker
+that has tried all n variables without improving is at a local optimum; it is
+reseeded in place with a fresh random assignment, which makes the batch a
+multistart search whose interpreter overhead is shared by K walkers.
+"""
+import numpy as np
+
+from maxsat import progress
+from maxsat.compiled import compile_clauses, occurrence_matrix
+from maxsat.incremental import normalise_clauses
+
+# True-count of the padding clause; never 0 or 1, so it never makes or breaks.
+PADDING_COUNT = 100
+
+
+def _true_counts(solutions, literals, offsets):
+    """Returns the (K, m + 1) uint8 true-literal counts of K assignments."""
+    values = solutions[:, np.abs(literals) - 1] == (literals > 0)
+    counts = np.zeros((len(solutions), len(offsets)), dtype=np.uint8)
+    # Empty clauses keep a count of 0; see `maxsat.compiled.evaluate_compiled`.
+    nonempty = offsets[:-1] < offsets[1:]
+    counts[:, :-1][:, nonempty] = np.add.reduceat(values, offsets[:-1][nonempty], axis=1)
+    counts[:, -1] = PADDING_COUNT
+    return counts
+
+
+def batched_msnahc(clauses, num_vars, rng, num_walkers=256, max_evaluations=20000000, target=None):
+    search_clauses, tautologies = normalise_clauses(clauses)
+    if target is None:
+        target = len(search_clauses) + tautologies
+    literals, offsets = compile_clauses(search_clauses)
+    occurrence_clauses, occurrence_positive = occurrence_matrix(num_vars, literals, offsets)
+    num_clauses = len(search_clauses)
+    rows = np.arange(num_walkers)
+
+    def reseed(walkers):
+        solutions[walkers] = rng.bit_matrix(len(walkers), num_vars)
+        counts[walkers] = _true_counts(solutions[walkers], literals, offsets)
+        fitness[walkers] = (counts[walkers, :-1] > 0).sum(axis=1)
+        orders[walkers] = np.argsort(rng.generator.random((len(walkers), num_vars)), axis=1)
+        positions[walkers] = 0
+        failures[walkers] = 0
+
+    solutions = np.empty((num_walkers, num_vars), dtype=np.uint8)
+    counts = np.empty((num_walkers, num_clauses + 1), dtype=np.uint8)
+    fitness = np.empty(num_walkers, dtype=np.int64)
+    orders = np.empty((num_walkers, num_vars), dtype=np.int64)
+    positions = np.empty(num_walkers, dtype=np.int64)
+    failures = np.empty(num_walkers, dtype=np.int64)
+    reseed(rows)
+
+    evaluations = num_walkers
+    restarts = 0
+    best_fitness = -1
+    best_solution = None
+    best_eval_count = 0
+    trace = []
+
+    while True:
+        leader = int(fitness.argmax())
+        if fitness[leader] > best_fitness:
+            best_fitness = int(fitness[leader])
+            best_solution = solutions[leader].copy()
+            best_eval_count = evaluations
+            trace.append([evaluations, best_fitness + tautologies])
+        if best_fitness + tautologies >= target or evaluations >= max_evaluations:
+            break
+        progress.report(evaluations, best_fitness + tautologies, restarts)
+
+        # Every walker proposes the next variable of its own visiting order.
+        variables = orders[rows, positions]
+        positions = (positions + 1) % num_vars
+        occurring = occurrence_clauses[variables]
+        literal_true = occurrence_positive[variables] == solutions[rows, variables].astype(bool)[:, None]
+        true_counts = counts[rows[:, None], occurring]
+        make = (~literal_true & (true_counts == 0)).sum(axis=1)
+        brk = (literal_true & (true_counts == 1)).sum(axis=1)
+        delta = make - brk
+        evaluations += num_walkers
+
+        accepted = np.flatnonzero(delta > 0)
+        if len(accepted):
+            flipped = variables[accepted]
+            solutions[accepted, flipped] ^= 1
+            change = np.where(literal_true[accepted], -1, 1).astype(np.int16)
+            change[occurring[accepted] == num_clauses] = 0
+            cells = (accepted[:, None], occurring[accepted])
+            counts[cells] = (counts[cells] + change).astype(np.uint8)
+            fitness[accepted] += delta[accepted]
+        failures += 1
+        failures[accepted] = 0
+
+        stuck = np.flatnonzero(failures >= num_vars)
+        if len(stuck):
+            restarts += len(stuck)
+            evaluations += len(stuck)
+            reseed(stuck)
+
+    return best_solution.tolist(), best_fitness + tautologies, best_eval_count, evaluations, trace, restarts
+
+
+def run_msnahc_batched(clauses, num_vars, rng, num_walkers=256, max_evaluations=20000000, *, target=None):
+    best_solution, best_fitness, best_eval_count, evaluations, trace, restarts = batched_msnahc(
+        clauses, num_vars, rng, num_walkers, max_evaluations, target)
+    return {
+        'best_solution': best_solution,
+        'best_fitness': best_fitness,
+        'evaluations': best_eval_count,
+        'total_evaluations': evaluations,
+        'trace': trace,
+        'restarts': restarts,
+    }
@@ -0,0 +1,291 @@
+"""Dynamic clause-weighting local search: PAWS and SAPS.
+
+Both searches flip greedily on a weighted cost, the total weight of the
+unsatisfied clauses. At a local minimum of that cost they raise the weights
+of the clauses still unsatisfied, which turns the plateau into a slope, and
+now and then smooth the weights back so old increases are forgotten:
+
+    paws  additive: +1 on every unsatisfied clause, and -1 on every clause
+          heavier than 1 after `max_increments` increases (Thornton et al.)
+    saps  multiplicative: unsatisfied weights times `alpha`, and with
+          probability `smooth_probability` every weight moved towards the
+          mean by `rho` (Hutter, Tompkins and Hoos)
+
+The best solution is still judged on the plain satisfied-clause count.
+"""
+from maxsat import progress
+from maxsat.incremental import FlipState
+
+# Weighted scores within this of zero count as zero; SAPS weights are floats.
+EPSILON = 1e-9
+
+
+class _IndexedSet:
+    """A set of integers below `size` with O(1) add, discard and uniform access."""
+
+    def __init__(self, size):
+        self.items = []
+        self.position = [-1] * size
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, item):
+        if self.position[item] < 0:
+            self.position[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item):
+        index = self.position[item]
+        if index >= 0:
+            last = self.items.pop()
+            if last != item:
+                self.items[index] = last
+                self.position[last] = index
+            self.position[item] = -1
+
+
+class WeightedFlipState(FlipState):
+    """A `FlipState` whose make and break counts are sums of clause weights.
+
+    `fitness` stays the number of satisfied clauses. The unsatisfied clauses
+    and the improving variables (positive weighted score) are kept as indexed
+    sets, so local minima and the best improving flip are found without
+    scanning every variable. Changing one clause weight costs O(clause length).
+
+    Args:
+        clauses: A list of clauses.
+        num_vars: The number of variables.
+        solution: Initial 0/1 assignment; it is copied.
+        occurrences: Precomputed `occurrence_lists` of the normalised clauses.
+    """
+
+    def __init__(self, clauses, num_vars, solution, occurrences=None):
+        self.weights = None
+        super().__init__(clauses, num_vars, solution, occurrences)
+
+    def reset(self, solution):
+        """Replaces the assignment and recomputes all counts from scratch."""
+        if self.weights is None:
+            self.weights = [1] * len(self.clauses)
+        self.solution = [int(bool(value)) for value in solution]
+        self._recount()
+
+    def set_weights(self, weights):
+        """Replaces every clause weight and recomputes the scores."""
+        self.weights = list(weights)
+        self._recount()
+
+    def _recount(self):
+        weights = self.weights
+        self.true_count = [0] * len(self.clauses)
+        self.make = [0] * self.num_vars
+        self.brk = [0] * self.num_vars
+        self.unsatisfied = _IndexedSet(len(self.clauses))
+
+        satisfied = 0
+        for index, clause in enumerate(self.clauses):
+            true_literals = [literal for literal in clause if self.solution[abs(literal) - 1] == (literal > 0)]
+            self.true_count[index] = len(true_literals)
+            if not true_literals:
+                self.unsatisfied.add(index)
+                for literal in clause:
+                    self.make[abs(literal) - 1] += weights[index]
+            else:
+                satisfied += 1
+                if len(true_literals) == 1:
+                    self.brk[abs(true_literals[0]) - 1] += weights[index]
+        self.fitness = satisfied + self.tautologies
+
+        self.improving = _IndexedSet(self.num_vars)
+        for var in range(self.num_vars):
+            if self.score(var) > EPSILON:
+                self.improving.add(var)
+
+    def _refresh(self, changed):
+        for var in changed:
+            if self.make[var] - self.brk[var] > EPSILON:
+                self.improving.add(var)
+            else:
+                self.improving.discard(var)
+
+    def flip(self, var):
+        """Flips 0-based variable `var` and updates every count it affects.
+
+        Returns:
+            The variables whose score changed (possibly with repeats).
+        """
+        self.solution[var] ^= 1
+        value = self.solution[var]
+        true_count = self.true_count
+        weights = self.weights
+        make = self.make
+        brk = self.brk
+        changed = [var]
+
+        for index, positive in self.occurrences[var]:
+            weight = weights[index]
+            if positive == bool(value):
+                true_count[index] += 1
+                if true_count[index] == 1:
+                    self.fitness += 1
+                    self.unsatisfied.discard(index)
+                    for literal in self.clauses[index]:
+                        make[abs(literal) - 1] -= weight
+                        changed.append(abs(literal) - 1)
+                    brk[var] += weight
+                elif true_count[index] == 2:
+                    for literal in self.clauses[index]:
+                        other = abs(literal) - 1
+                        if other != var and self.solution[other] == (literal > 0):
+                            brk[other] -= weight
+                            changed.append(other)
+                            break
+            else:
+                true_count[index] -= 1
+                if true_count[index] == 0:
+                    self.fitness -= 1
+                    self.unsatisfied.add(index)
+                    for literal in self.clauses[index]:
+                        make[abs(literal) - 1] += weight
+                        changed.append(abs(literal) - 1)
+                    brk[var] -= weight
+                elif true_count[index] == 1:
+                    other = self._sole_true_var(index)
+                    brk[other] += weight
+                    changed.append(other)
+
+        self._refresh(changed)
+        return changed
+
+    def add_weight(self, index, delta):
+        """Adds `delta` to the weight of clause `index` and updates the scores it enters."""
+        self.weights[index] += delta
+        if self.true_count[index] == 0:
+            changed = [abs(literal) - 1 for literal in self.clauses[index]]
+            for var in changed:
+                self.make[var] += delta
+        elif self.true_count[index] == 1:
+            changed = [self._sole_true_var(index)]
+            self.brk[changed[0]] += delta
+        else:
+            return
+        self._refresh(changed)
+
+    def best_improving(self, random):
+        """Returns an improving variable of the highest score (ties broken randomly), or None."""
+        best = []
+        best_score = EPSILON
+        for var in self.improving.items:
+            score = self.make[var] - self.brk[var]
+            if score > best_score + EPSILON:
+                best = [var]
+                best_score = score
+            elif score >= best_score - EPSILON:
+                best.append(var)
+        return best[random.randrange(len(best))] if best else None
+
+
+def _search(clauses, num_vars, rng, max_evaluations, escape, target=None):
+    """Runs the shared greedy loop, calling `escape(state)` at every local minimum.
+
+    `escape` either returns a variable to flip or None after changing weights.
+    Every step is charged `num_vars` evaluations, like the other flip-score
+    searches. The loop stops once `target` clauses (default all) are satisfied.
+    """
+    state = WeightedFlipState(clauses, num_vars, rng.bit_list(num_vars))
+    if target is None:
+        target = len(state.clauses) + state.tautologies
+    evaluations = 1
+    best_solution = None
+    best_fitness = -1
+    best_eval_count = 0
+    trace = []
+
+    while True:
+        if state.fitness > best_fitness:
+            best_solution = list(state.solution)
+            best_fitness = state.fitness
+            best_eval_count = evaluations
+            trace.append([evaluations, best_fitness])
+        if best_fitness >= target or evaluations >= max_evaluations:
+            break
+
+        evaluations += num_vars
+        progress.report(evaluations, best_fitness)
+        var = state.best_improving(rng.random)
+        if var is None:
+            var = escape(state)
+        if var is not None:
+            state.flip(var)
+
+    return best_solution, best_fitness, best_eval_count, evaluations, trace
+
+
+def paws(clauses, num_vars, rng, max_evaluations=20000000, flat_probability=0.15, max_increments=10, target=None):
+    random = rng.random
+    increments = 0
+    weight_updates = 0
+
+    def escape(state):
+        nonlocal increments, weight_updates
+        if random.random() < flat_probability:
+            # A sideways move among the variables of the unsatisfied clauses.
+            flat = [abs(literal) - 1 for index in state.unsatisfied.items for literal in state.clauses[index]
+                    if abs(state.score(abs(literal) - 1)) <= EPSILON]
+            if flat:
+                return flat[random.randrange(len(flat))]
+        for index in list(state.unsatisfied.items):
+            state.add_weight(index, 1)
+        increments += 1
+        weight_updates += 1
+        if increments % max_increments == 0:
+            for index, weight in enumerate(state.weights):
+                if weight > 1:
+                    state.add_weight(index, -1)
+        return None
+
+    return _search(clauses, num_vars, rng, max_evaluations, escape, target) + (weight_updates,)
+
+
+def saps(clauses, num_vars, rng, max_evaluations=20000000, alpha=1.3, rho=0.8, smooth_probability=0.05,
+         walk_probability=0.01, target=None):
+    random = rng.random
+    weight_updates = 0
+
+    def escape(state):
+        nonlocal weight_updates
+        if random.random() < walk_probability:
+            return random.randrange(num_vars)
+        for index in list(state.unsatisfied.items):
+            state.add_weight(index, state.weights[index] * (alpha - 1))
+        weight_updates += 1
+        if random.random() < smooth_probability:
+            mean = sum(state.weights) / len(state.weights)
+            state.set_weights([rho * weight + (1 - rho) * mean for weight in state.weights])
+        return None
+
+    return _search(clauses, num_vars, rng, max_evaluations, escape, target) + (weight_updates,)
+
+
+def _result(search):
+    best_solution, best_fitness, best_eval_count, evaluations, trace, weight_updates = search
+    return {
+        'best_solution': best_solution,
+        'best_fitness': best_fitness,
+        'evaluations': best_eval_count,
+        'total_evaluations': evaluations,
+        'trace': trace,
+        'weight_updates': weight_updates,
+    }
+
+
+def run_paws(clauses, num_vars, rng, max_evaluations=20000000, flat_probability=0.15, max_increments=10, *,
+             target=None):
+    return _result(paws(clauses, num_vars, rng, max_evaluations, flat_probability, max_increments, target))
+
+
+def run_saps(clauses, num_vars, rng, max_evaluations=20000000, alpha=1.3, rho=0.8, smooth_probability=0.05,
+             walk_probability=0.01, *, target=None):
+    return _result(saps(clauses, num_vars, rng, max_evaluations, alpha, rho, smooth_probability, walk_probability,
+                        target))
@@ -0,0 +1,201 @@
+"""Genetic algorithm from Assignment 3.
+
+Individuals are lists of signed literals (``x`` or ``-x`` for variable x).
+
+Every individual keeps the number of true literals of each clause, packed one
+byte per clause. A child is evaluated from the parent that gave it the longer
+part of its genes: the parent's counts are copied and only the variables where
+the child differs from it are applied as flips, through the occurrence lists.
+Once the population has converged, children differ from their parents in a
+few bits and evaluation costs a few flips instead of a pass over all clauses.
+"""
+from array import array
+from copy import deepcopy
+
+import numpy as np
+
+from maxsat import progress
+from maxsat.incremental import occurrence_lists
+
+
+def check_all(clauses, state):
+    """Returns the number of clauses left unsatisfied by `state`.
+
+    The from-scratch count; `OffspringEvaluator` gives the same result.
+    """
+    unsatisfied_clauses = deepcopy(clauses)
+    for literal in state:
+        i = 0
+        while i < len(unsatisfied_clauses):
+            if literal in unsatisfied_clauses[i]:
+                unsatisfied_clauses.remove(unsatisfied_clauses[i])
+            else:
+                i += 1
+    return len(unsatisfied_clauses)
+
+
+class OffspringEvaluator:
+    """Evaluates individuals, incrementally from a parent where possible.
+
+    The evaluation state of an individual is a tuple of its clause true-counts
+    (an `array`) and its number of unsatisfied clauses.
+
+    Args:
+        clauses: A list of clauses; repeated literals and tautologies are
+            counted as `check_all` counts them.
+        num_vars: The number of variables.
+    """
+
+    def __init__(self, clauses, num_vars):
+        self.clauses = clauses
+        self.occurrences = occurrence_lists(clauses, num_vars)
+        longest = max((len(clause) for clause in clauses), default=0)
+        self.typecode = 'B' if longest < 256 else 'L'
+
+    def evaluate(self, individual):
+        """Returns the state of `individual`, computed from scratch."""
+        truth = set(individual)
+        counts = array(self.typecode, [sum(literal in truth for literal in clause) for clause in self.clauses])
+        return counts, counts.count(0)
+
+    def derive(self, state, individual, variables):
+        """Returns the state of `individual` from the `state` of a parent.
+
+        Args:
+            state: State of the parent.
+            individual: The child.
+            variables: The 0-based variables at which the child differs from
+                the parent, and only those.
+        """
+        counts, unsatisfied = state
+        counts = counts[:]
+        occurrences = self.occurrences
+        for var in variables:
+            value = individual[var] > 0
+            for index, positive in occurrences[var]:
+                if positive == value:
+                    if not counts[index]:
+                        unsatisfied -= 1
+                    counts[index] += 1
+                else:
+                    counts[index] -= 1
+                    if not counts[index]:
+                        unsatisfied += 1
+        return counts, unsatisfied
+
+
+def random_population(num_vars, size, rng):
+    variables = np.arange(1, num_vars + 1)
+    return np.where(rng.bit_matrix(size, num_vars), variables, -variables).tolist()
+
+
+def genetic_algorithm(clauses, num_vars, population_size, max_evaluations, mutation_rate, rng, elite_fraction=0.15,
+                      target=None):
+    if target is None:
+        target = len(clauses)
+    evaluator = OffspringEvaluator(clauses, num_vars)
+    evaluation_count = 0
+    population = random_population(num_vars, population_size, rng)
+    states = [evaluator.evaluate(individual) for individual in population]
+
+    first = min(range(len(population)), key=lambda index: states[index][1])
+    best_solution = population[first]
+    best_fitness = len(clauses) - states[first][1]
+
+    while evaluation_count < max_evaluations:
+        evaluation_count += len(population)
+
+        order = sorted(range(len(population)), key=lambda index: states[index][1])
+        population = [population[index] for index in order]
+        states = [states[index] for index in order]
+        fitness_scores = [unsatisfied for _, unsatisfied in states]
+
+        current_best_fitness = len(clauses) - fitness_scores[0]
+        if current_best_fitness > best_fitness:
+            best_fitness = current_best_fitness
+            best_solution = population[0]
+        progress.report(evaluation_count, best_fitness)
+        if best_fitness >= target:
+            break
+
+        parents = clone_population(len(clauses), fitness_scores, population_size, rng)
+        new_population, origins = population_crossover(population, parents, rng)
+        for index, var in mutate_population(new_population, mutation_rate, rng):
+            origins[index][1].symmetric_difference_update((var,))
+
+        # The best `elite_fraction` of the population survives unchanged.
+        survivors = int(population_size * elite_fraction)
+        children = population_size - survivors
+        population = population[:survivors] + new_population[:children]
+        states = states[:survivors] + [evaluator.derive(states[base], child, variables)
+                                       for child, (base, variables) in zip(new_population[:children], origins)]
+
+    return best_solution, best_fitness / len(clauses) if clauses else 1.0, evaluation_count
+
+
+def clone_population(num_clauses, fitness_scores, size, rng):
+    """Returns the indices of `size` individuals drawn with weights proportional to fitness.
+
+    The weights are satisfied clause counts; when no individual satisfies any
+    clause they are all zero and the individuals are drawn uniformly.
+    """
+    weights = [num_clauses - score for score in fitness_scores]
+    if sum(weights) == 0:
+        return rng.random.choices(range(len(fitness_scores)), k=size)
+    return rng.random.choices(range(len(fitness_scores)), weights=weights, k=size)
+
+
+def population_crossover(population, parents, rng):
+    """Returns one-point crossovers of random pairs of `parents` (indices into `population`).
+
+    Returns:
+        The children, and for each child the index of the parent it takes the
+        longer part from and the set of variables at which it differs from it.
+    """
+    new_population = []
+    origins = []
+    size = len(parents)
+    num_vars = len(population[0])
+    for _ in range(size):
+        # With a single variable the only cut copies the first parent.
+        limit = rng.random.randint(1, max(1, num_vars - 1))
+        first = parents[rng.random.randint(0, size - 1)]
+        second = parents[rng.random.randint(0, size - 1)]
+        parent1 = population[first]
+        parent2 = population[second]
+        new_population.append(parent1[:limit] + parent2[limit:])
+        if limit >= num_vars - limit:
+            base, span = first, range(limit, num_vars)
+        else:
+            base, span = second, range(limit)
+        origins.append((base, {var for var in span if parent1[var] != parent2[var]}))
+    return new_population, origins
+
+
+def mutate_population(population, mutation_rate, rng):
+    """Flips random literals of random individuals in place.
+
+    Returns:
+        The (individual index, variable) of every flip.
+    """
+    num_vars = len(population[0])
+    num_to_mutate = int(len(population) * mutation_rate)
+    flips = []
+    for _ in range(num_to_mutate):
+        position = rng.random.randint(0, len(population) - 1)
+        individual = population[position]
+        index = rng.random.randint(0, num_vars - 1)
+        individual[index] = -individual[index]
+        flips.append((position, index))
+    return flips
+
+
+def run_ga(clauses, num_vars, rng, population_size=10, max_evaluations=1000, mutation_rate=0.1, elite_fraction=0.15,
+           *, target=None):
+    best_solution, best_ratio, evaluation_count = genetic_algorithm(
+        clauses, num_vars, population_size, max_evaluations, mutation_rate, rng, elite_fraction, target)
+    return {
+        'best_solution': [int(literal > 0) for literal in best_solution],
+        'best_fitness': round(best_ratio * len(clauses)),
+        'evaluations': evaluation_count,
+    }
@@ -0,0 +1,339 @@
+"""Hill climbers from Assignment 2 (NAHC, MSNAHC, VNA, MSVNA) and GSAT."""
+import itertools
+
+from maxsat import progress
+from maxsat.buckets import buckets_for
+from maxsat.elite import relinker_for
+from maxsat.fitness import evaluate_fitness
+from maxsat.incremental import FlipState, normalise_clauses, occurrence_lists
+from maxsat.zobrist import ZobristTable, cache_for
+
+
+# Neighbours are built lazily from a shuffled list of the bit positions to
+# flip; shuffling the positions draws the same permutation a shuffled list of
+# prebuilt neighbours would.
+def flip_bits(solution, bit_indices):
+    neighbour = list(solution)
+    for i in bit_indices:
+        neighbour[i] = 1 - neighbour[i]
+    return neighbour
+
+
+def neighbour_hash(zobrist, solution_hash, bit_indices):
+    for i in bit_indices:
+        solution_hash ^= zobrist.keys[i]
+    return solution_hash
+
+
+def cached_fitness(solution, clauses, cache, key):
+    """Evaluates a solution unless `cache` already holds the fitness of its hash."""
+    if cache is None:
+        return evaluate_fitness(solution, clauses)
+    fitness = cache.get(key)
+    if fitness is None:
+        fitness = evaluate_fitness(solution, clauses)
+        cache.put(key, fitness)
+    return fitness
+
+
+# Next Ascent Hillclimbing using 1-bit Hamming Distance neighbours. Every
+# iteration moves to the best neighbour (ties broken randomly), read from the
+# score buckets instead of evaluating all n neighbours.
+def next_ascent_hillclimbing(clauses, initial_solution, max_iterations, rng):
+    state = FlipState(clauses, len(initial_solution), initial_solution)
+    buckets = buckets_for(state)
+    evaluations = 1
+
+    for _ in range(max_iterations):
+        if buckets.best_score() <= 0:
+            break
+        evaluations += state.num_vars
+        for var in state.flip(buckets.pick_best(rng.random)):
+            buckets.update(var, state.score(var))
+        progress.report(evaluations, state.fitness)
+
+    return state.solution, evaluations
+
+
+# Multistart Next Ascent Hillclimbing (MSNAHC). With a cache, assignments
+# are identified by their Zobrist hash and revisited ones are not re-evaluated;
+# they still count as evaluations, so the search itself is unchanged. With a
+# relinker, each restart starts from a path towards an elite solution instead
+# of from a random assignment. The search stops once it satisfies `target`
+# clauses (all of them by default).
+def msnahc(clauses, num_vars, rng, max_evaluations=20000000, cache=None, relinker=None, target=None):
+    if target is None:
+        target = len(clauses)
+    global_evaluations = 0
+    best_solution = None
+    best_fitness = -1
+    best_eval_count = 0
+    trace = []
+    zobrist = ZobristTable(num_vars) if cache is not None else None
+    current_hash = None
+    restart_solution = None
+    restarts = 0
+
+    while global_evaluations < max_evaluations:
+
+        current_solution = restart_solution if restart_solution is not None else rng.bit_list(num_vars)
+        if zobrist is not None:
+            current_hash = zobrist.hash(current_solution)
+        current_fitness = cached_fitness(current_solution, clauses, cache, current_hash)
+        eval_count = 1
+
+        while eval_count + global_evaluations < max_evaluations:
+            order = [(i,) for i in range(num_vars)]
+            rng.shuffle(order)
+            local_best = False
+
+            for bit_indices in order:
+                neighbour = flip_bits(current_solution, bit_indices)
+                key = neighbour_hash(zobrist, current_hash, bit_indices) if zobrist is not None else None
+                neighbour_fitness = cached_fitness(neighbour, clauses, cache, key)
+                eval_count += 1
+
+                if neighbour_fitness > current_fitness:
+                    current_solution = neighbour
+                    current_fitness = neighbour_fitness
+                    current_hash = key
+                    local_best = True
+                    break
+
+            if not local_best:
+                break
+
+        global_evaluations += eval_count
+
+        if current_fitness > best_fitness:
+            best_solution = current_solution
+            best_fitness = current_fitness
+            best_eval_count = global_evaluations
+            trace.append([global_evaluations, best_fitness])
+        progress.report(global_evaluations, best_fitness, restarts)
+
+        if best_fitness >= target:
+            break
+
+        restarts += 1
+        if relinker is not None:
+            restart_solution, relink_evaluations = relinker.restart(current_solution, current_fitness, rng)
+            global_evaluations += relink_evaluations
+
+    return best_solution, best_fitness, best_eval_count, global_evaluations, trace
+
+
+# Variable Neighbourhood Ascent (VNA) up to 3-bit Hamming Distance
+def variable_neighbourhood_ascent(initial_solution, clauses, max_iterations, rng, cache=None):
+    current_solution = initial_solution
+    best_solution = current_solution
+    zobrist = ZobristTable(len(initial_solution)) if cache is not None else None
+    current_hash = zobrist.hash(current_solution) if zobrist is not None else None
+
+    best_fitness = cached_fitness(current_solution, clauses, cache, current_hash)
+    evaluations = 1
+
+    k = 1
+    while k <= 3:
+        order = list(itertools.combinations(range(len(current_solution)), k))
+        rng.shuffle(order)
+
+        improvement_found = False
+        for bit_indices in order:
+            neighbour = flip_bits(current_solution, bit_indices)
+            key = neighbour_hash(zobrist, current_hash, bit_indices) if zobrist is not None else None
+            fitness = cached_fitness(neighbour, clauses, cache, key)
+            evaluations += 1
+            if fitness > best_fitness:
+                best_solution = neighbour
+                best_fitness = fitness
+                current_hash = key
+                improvement_found = True
+                break
+
+        if improvement_found:
+            current_solution = best_solution
+            k = 1
+        else:
+            k += 1
+        progress.report(evaluations, best_fitness)
+
+    return best_solution, evaluations
+
+
+# Multistart Variable Neighbourhood Ascent (MSVNA)
+def multi_start_vna(clauses, num_vars, max_iterations, max_evaluations, rng, cache=None, relinker=None, target=None):
+    if target is None:
+        target = len(clauses)
+    total_evaluations = 0
+    best_global_solution = None
+    best_global_fitness = 0
+    zobrist = ZobristTable(num_vars) if cache is not None else None
+    current_hash = None
+    neighbourhoods = {}
+    restart_solution = None
+    restarts = 0
+
+    while total_evaluations < max_evaluations:
+        initial_solution = restart_solution if restart_solution is not None else rng.bit_list(num_vars)
+        current_solution = initial_solution
+        best_solution = current_solution
+        if zobrist is not None:
+            current_hash = zobrist.hash(current_solution)
+        best_fitness = cached_fitness(current_solution, clauses, cache, current_hash)
+
+        evaluations = 0
+        k = 1
+        while k <= 3 and evaluations < max_iterations:
+            if k not in neighbourhoods:
+                neighbourhoods[k] = list(itertools.combinations(range(num_vars), k))
+            # Shuffle a copy: every shuffle starts from the combinations order,
+            # as it would with the neighbours rebuilt.
+            order = list(neighbourhoods[k])
+            rng.shuffle(order)
+
+            improvement_found = False
+            for bit_indices in order:
+                neighbour = flip_bits(current_solution, bit_indices)
+                key = neighbour_hash(zobrist, current_hash, bit_indices) if zobrist is not None else None
+                fitness = cached_fitness(neighbour, clauses, cache, key)
+                evaluations += 1
+                total_evaluations += 1
+
+                if fitness > best_fitness:
+                    best_solution = neighbour
+                    best_fitness = fitness
+                    current_hash = key
+                    improvement_found = True
+                    break
+
+                if total_evaluations >= max_evaluations:
+                    break
+
+            if improvement_found:
+                current_solution = best_solution
+                k = 1
+            else:
+                k += 1
+
+            if total_evaluations >= max_evaluations:
+                break
+
+        if best_fitness > best_global_fitness:
+            best_global_solution = best_solution
+            best_global_fitness = best_fitness
+        progress.report(total_evaluations, best_global_fitness, restarts)
+
+        if best_global_fitness >= target:
+            break
+
+        restarts += 1
+        if relinker is not None:
+            restart_solution, relink_evaluations = relinker.restart(best_solution, best_fitness, rng)
+            total_evaluations += relink_evaluations
+
+    return best_global_solution, total_evaluations
+
+
+# GSAT: always take the best flip, even when it does not improve, and restart
+# from a random assignment every max_flips flips, until `target` clauses are
+# satisfied.
+def gsat(clauses, num_vars, rng, max_flips, max_tries, target=None):
+    if target is None:
+        target = len(clauses)
+    occurrences = occurrence_lists(normalise_clauses(clauses)[0], num_vars)
+    best_solution = None
+    best_fitness = -1
+    best_eval_count = 0
+    evaluations = 0
+    trace = []
+
+    for tries in range(max_tries):
+        state = FlipState(clauses, num_vars, rng.bit_list(num_vars), occurrences)
+        buckets = buckets_for(state)
+        evaluations += 1
+
+        for flip in range(max_flips + 1):
+            if state.fitness > best_fitness:
+                best_solution = list(state.solution)
+                best_fitness = state.fitness
+                best_eval_count = evaluations
+                trace.append([evaluations, best_fitness])
+            if best_fitness >= target or flip == max_flips:
+                break
+            evaluations += num_vars
+            for var in state.flip(buckets.pick_best(rng.random)):
+                buckets.update(var, state.score(var))
+            progress.report(evaluations, best_fitness, tries)
+
+        if best_fitness >= target:
+            break
+
+    return best_solution, best_fitness, best_eval_count, evaluations, trace
+
+
+def run_nahc(clauses, num_vars, rng, max_iterations=10000):
+    best_solution, evaluations = next_ascent_hillclimbing(clauses, rng.bit_list(num_vars), max_iterations, rng)
+    return {
+        'best_solution': best_solution,
+        'best_fitness': evaluate_fitness(best_solution, clauses),
+        'evaluations': evaluations,
+    }
+
+
+def _with_stats(result, cache, relinker=None):
+    if cache is not None:
+        result['cache'] = cache.stats()
+    if relinker is not None:
+        result['elite'] = relinker.stats()
+    return result
+
+
+def run_msnahc(clauses, num_vars, rng, max_evaluations=20000000, cache_mb=0, elite_size=0, *, elite=None, target=None):
+    cache = cache_for(cache_mb)
+    relinker = relinker_for(elite, elite_size, clauses, num_vars)
+    best_solution, best_fitness, best_eval_count, global_evaluations, trace = msnahc(
+        clauses, num_vars, rng, max_evaluations, cache=cache, relinker=relinker, target=target)
+    return _with_stats({
+        'best_solution': best_solution,
+        'best_fitness': best_fitness,
+        'evaluations': best_eval_count,
+        'total_evaluations': global_evaluations,
+        'trace': trace,
+    }, cache, relinker)
+
+
+def run_vna(clauses, num_vars, rng, max_iterations=10000, cache_mb=0):
+    cache = cache_for(cache_mb)
+    best_solution, evaluations = variable_neighbourhood_ascent(
+        rng.bit_list(num_vars), clauses, max_iterations, rng, cache=cache)
+    return _with_stats({
+        'best_solution': best_solution,
+        'best_fitness': evaluate_fitness(best_solution, clauses),
+        'evaluations': evaluations,
+    }, cache)
+
+
+def run_msvna(clauses, num_vars, rng, max_iterations=10000, max_evaluations=10000000, cache_mb=0, elite_size=0,
+              *, elite=None, target=None):
+    cache = cache_for(cache_mb)
+    relinker = relinker_for(elite, elite_size, clauses, num_vars)
+    best_solution, total_evaluations = multi_start_vna(
+        clauses, num_vars, max_iterations, max_evaluations, rng, cache=cache, relinker=relinker, target=target)
+    return _with_stats({
+        'best_solution': best_solution,
+        'best_fitness': evaluate_fitness(best_solution, clauses),
+        'evaluations': total_evaluations,
+    }, cache, relinker)
+
+
+def run_gsat(clauses, num_vars, rng, max_flips=10000, max_tries=100, *, target=None):
+    best_solution, best_fitness, best_eval_count, evaluations, trace = gsat(
+        clauses, num_vars, rng, max_flips, max_tries, target)
+    return {
+        'best_solution': best_solution,
+        'best_fitness': best_fitness,
+        'evaluations': best_eval_count,
+        'total_evaluations': evaluations,
+        'trace': trace,
+    }
@@ -0,0 +1,149 @@
+"""Tabu search from Assignment 3 (restarted from a random solution when stuck)."""
+import time
+
+import numpy as np
+
+from maxsat import progress
+from maxsat.buckets import buckets_for
+from maxsat.elite import relinker_for
+from maxsat.incremental import FlipState
+from maxsat.zobrist import ZobristTable
+
+
+def best_allowed_flip(state, buckets, tabu_list, best_fitness, rng, zobrist, solution_hash):
+    """Returns the best flip whose neighbour is not tabu, or beats best_fitness.
+
+    Candidates are read from the score buckets in descending order, so only
+    the flips scoring at least as well as the chosen one are looked at. The
+    tabu list holds Zobrist hashes, so a neighbour is checked with one XOR
+    instead of by copying the assignment.
+
+    Returns:
+        A tuple of the variable to flip and the neighbour's fitness, or
+        (None, 0) when every neighbour is tabu.
+    """
+    keys = zobrist.keys
+    for score, var in buckets.descending(rng.random):
+        fitness = state.fitness + score
+        if fitness <= 0:
+            break
+        if fitness > best_fitness:
+            return var, fitness
+        if solution_hash ^ keys[var] not in tabu_list:
+            return var, fitness
+    return None, 0
+
+
+def sampled_allowed_flip(state, sample, tabu_list, best_fitness, keys, solution_hash):
+    """Like `best_allowed_flip`, over the flips of the variables in `sample` only."""
+    best_var, best_neighbour_fitness = None, 0
+    for var in sample:
+        fitness = state.fitness + state.score(var)
+        if fitness > best_neighbour_fitness and (fitness > best_fitness or solution_hash ^ keys[var] not in tabu_list):
+            best_var, best_neighbour_fitness = var, fitness
+    return best_var, best_neighbour_fitness
+
+
+# Tabu search over single flips. Each iteration evaluates `sample_size` random
+# flips (all of them when sample_size is 0 or at least num_vars). The walk is
+# restarted after `allowable_failures` iterations without improving its own
+# best (0 never restarts for stagnation) or when every flip is tabu, and the
+# search ends after `max_failures` iterations without a new overall best.
+# Both default to 0, the behaviour of Assignment 3's script, which took the
+# parameters but always scored every flip and never restarted a stalled walk.
+def tabu_search(num_vars, clauses, max_failures, allowable_failures, max_evaluations, rng, sample_size=0,
+                relinker=None, tabu_tenure=10, target=None):
+    sampled = 0 < sample_size < num_vars
+
+    state = FlipState(clauses, num_vars, rng.bit_list(num_vars))
+    best_solution = list(state.solution)
+    best_fitness = state.fitness
+    buckets = None if sampled else buckets_for(state)
+    zobrist = ZobristTable(num_vars)
+    solution_hash = zobrist.hash(state.solution)
+
+    tabu_list = []
+    num_failures = 0
+    stalled = 0
+    walk_best = state.fitness
+    evaluation_count = 0
+    restarts = 0
+
+    fitness_over_time = []
+    time_over_iterations = []
+
+    while num_failures < max_failures and evaluation_count < max_evaluations and (
+            target is None or best_fitness < target):
+        start_iteration_time = time.time()
+
+        if sampled:
+            sample = rng.random.sample(range(num_vars), sample_size)
+            var, _ = sampled_allowed_flip(state, sample, tabu_list, best_fitness, zobrist.keys, solution_hash)
+            evaluation_count += sample_size
+        else:
+            var, _ = best_allowed_flip(state, buckets, tabu_list, best_fitness, rng, zobrist, solution_hash)
+            evaluation_count += num_vars
+
+        if var is None or (allowable_failures and stalled >= allowable_failures):
+            if relinker is not None:
+                restart_solution, relink_evaluations = relinker.restart(state.solution, state.fitness, rng)
+                evaluation_count += relink_evaluations
+            else:
+                restart_solution = rng.bit_list(num_vars)
+            state.reset(restart_solution)
+            if not sampled:
+                buckets = buckets_for(state)
+            solution_hash = zobrist.hash(state.solution)
+            tabu_list = []
+            stalled = 0
+            walk_best = state.fitness
+            restarts += 1
+            num_failures += 1
+            continue
+
+        tabu_list.append(solution_hash)
+        if len(tabu_list) > tabu_tenure:
+            tabu_list.pop(0)
+        solution_hash ^= zobrist.keys[var]
+
+        changed = state.flip(var)
+        if not sampled:
+            for var in changed:
+                buckets.update(var, state.score(var))
+
+        if state.fitness > walk_best:
+            walk_best = state.fitness
+            stalled = 0
+        else:
+            stalled += 1
+
+        if state.fitness > best_fitness:
+            best_solution = list(state.solution)
+            best_fitness = state.fitness
+            num_failures = 0
+        else:
+            num_failures += 1
+
+        fitness_over_time.append(best_fitness)
+        time_over_iterations.append(time.time() - start_iteration_time)
+        progress.report(evaluation_count, best_fitness, restarts)
+
+    return best_solution, best_fitness, fitness_over_time, np.cumsum(time_over_iterations), evaluation_count, restarts
+
+
+def run_tabu(clauses, num_vars, rng, max_failures=100, allowable_failures=0, max_evaluations=100000, sample_size=0,
+             tabu_tenure=10, elite_size=0, *, elite=None, target=None):
+    relinker = relinker_for(elite, elite_size, clauses, num_vars)
+    best_solution, best_fitness, fitness_over_time, _, evaluation_count, restarts = tabu_search(
+        num_vars, clauses, max_failures, allowable_failures, max_evaluations, rng, sample_size=sample_size,
+        relinker=relinker, tabu_tenure=tabu_tenure, target=target)
+    result = {
+        'best_solution': [int(value) for value in best_solution],
+        'best_fitness': best_fitness,
+        'evaluations': evaluation_count,
+        'trace': fitness_over_time,
+        'restarts': restarts,
+    }
+    if relinker is not None:
+        result['elite'] = relinker.stats()
+    return result
@@ -0,0 +1,231 @@
+"""Upper bounds on the number of clauses an assignment can satisfy.
+
+A search that reaches an upper bound has provably found an optimum and can
+stop; otherwise the difference between the two (the gap) says how far from
+optimal its best solution can at most be. Two bounds are available:
+
+    cores   unit propagation finds inconsistent subsets of clauses: first
+            from the unit clauses alone, then by probing both values of a
+            variable (failed literals). Each subset found is removed before
+            looking for the next, and every one of these disjoint subsets
+            leaves at least one clause unsatisfied. Cheap, and valid at any
+            point, so probing stops after `max_probes` propagations.
+    lp      the linear relaxation: maximise the sum of clause indicators z
+            with z_j <= the sum of its literals over fractional variables
+            (scipy's HiGHS, imported lazily). Tight with many unit and binary
+            clauses; for random 3-SAT it is just the clause count.
+
+'both' takes the smaller. Neither finds much on uniform random 3-SAT below
+the threshold, where the clause count is the bound and only the satisfiable
+case stops early, as before.
+
+The bound depends on the clauses alone, not on the search, so rather than
+being maintained while a run goes it is computed once per instance (the job
+runner caches it per instance and method) and handed to the runs as their
+target. Within `core_bound` the propagation is incremental: the assignment
+forced by the unit clauses is kept between probes, each probe only
+propagates its decision and undoes it, and the state is rebuilt only when
+a subset is removed.
+"""
+from collections import deque
+
+BOUND_METHODS = ('cores', 'lp', 'both')
+
+
+def _prepare(clauses):
+    """Returns the clauses without repeated literals and the number of tautologies."""
+    prepared = []
+    tautologies = 0
+    for clause in clauses:
+        literals = sorted(set(clause), key=abs)
+        if any(-literal in literals for literal in literals):
+            tautologies += 1
+        else:
+            prepared.append(literals)
+    return prepared, tautologies
+
+
+class _Propagation:
+    """Unit propagation over the active clauses, kept between probes.
+
+    The assignment forced by the unit clauses is propagated once, when the
+    object is created (`conflict` holds its core, if it fails). Each probe
+    extends that assignment from one decision literal and is then undone
+    through the trail, so it only pays for the propagation it adds.
+    """
+
+    def __init__(self, clauses, occurrences, active):
+        self.clauses = clauses
+        self.occurrences = occurrences
+        self.active = active
+        self.value = {}
+        self.reason = {}
+        self.trail = []
+        self.conflict = self._units()
+
+    def _assign(self, literal, clause, queue):
+        self.value[abs(literal)] = literal > 0
+        self.reason[abs(literal)] = clause
+        self.trail.append(abs(literal))
+        queue.append(literal)
+
+    def _core(self, index):
+        """Returns the clauses whose propagation falsified clause `index`."""
+        core = {index}
+        stack = [abs(literal) for literal in self.clauses[index]]
+        seen = set(stack)
+        while stack:
+            clause = self.reason[stack.pop()]
+            if clause is None or clause in core:
+                continue
+            core.add(clause)
+            for literal in self.clauses[clause]:
+                if abs(literal) not in seen:
+                    seen.add(abs(literal))
+                    stack.append(abs(literal))
+        return core
+
+    def _status(self, index):
+        unassigned = None
+        for literal in self.clauses[index]:
+            current = self.value.get(abs(literal))
+            if current is None:
+                if unassigned is not None:
+                    return 'open', None
+                unassigned = literal
+            elif current == (literal > 0):
+                return 'satisfied', None
+        return ('unit', unassigned) if unassigned is not None else ('false', None)
+
+    def _run(self, queue):
+        while queue:
+            literal = queue.popleft()
+            for index in self.occurrences.get(-literal, ()):
+                if index not in self.active:
+                    continue
+                state, unit = self._status(index)
+                if state == 'false':
+                    return self._core(index)
+                if state == 'unit':
+                    self._assign(unit, index, queue)
+        return None
+
+    def _units(self):
+        queue = deque()
+        for index in self.active:
+            if len(self.clauses[index]) == 1:
+                literal = self.clauses[index][0]
+                current = self.value.get(abs(literal))
+                if current is None:
+                    self._assign(literal, index, queue)
+                elif current != (literal > 0):
+                    return self._core(index)
+        return self._run(queue)
+
+    def probe(self, decision):
+        """Returns the set of clauses refuting `decision`, or None; the assignment is restored either way."""
+        if abs(decision) in self.value:
+            return None
+        mark = len(self.trail)
+        queue = deque()
+        self._assign(decision, None, queue)
+        core = self._run(queue)
+        for var in self.trail[mark:]:
+            del self.value[var]
+            del self.reason[var]
+        del self.trail[mark:]
+        return core
+
+
+def core_bound(num_vars, clauses, max_probes=10000):
+    """Bounds the satisfiable clauses by counting disjoint inconsistent subsets.
+
+    Args:
+        num_vars: The number of variables.
+        clauses: A list of clauses.
+        max_probes: Most failed-literal propagations; the bound found so far
+            is returned when they run out.
+
+    Returns:
+        A tuple of the upper bound and the number of disjoint subsets found.
+    """
+    prepared, _ = _prepare(clauses)
+    occurrences = {}
+    for index, clause in enumerate(prepared):
+        for literal in clause:
+            occurrences.setdefault(literal, []).append(index)
+    active = set(range(len(prepared)))
+    cores = sum(1 for clause in prepared if not clause)
+    active -= {index for index, clause in enumerate(prepared) if not clause}
+
+    # Probe the variables occurring most often first; they propagate furthest.
+    variables = sorted(range(1, num_vars + 1),
+                       key=lambda var: -(len(occurrences.get(var, ())) + len(occurrences.get(-var, ()))))
+    probes = 0
+    while True:
+        propagation = _Propagation(prepared, occurrences, active)
+        core = propagation.conflict
+        if core is None:
+            for var in variables:
+                if probes >= max_probes:
+                    break
+                probes += 2
+                positive = propagation.probe(var)
+                if positive is None:
+                    continue
+                negative = propagation.probe(-var)
+                if negative is not None:
+                    core = positive | negative
+                    break
+        if core is None:
+            break
+        active -= core
+        cores += 1
+    return len(clauses) - cores, cores
+
+
+def lp_bound(num_vars, clauses):
+    """Bounds the satisfiable clauses by the optimum of the linear relaxation."""
+    import numpy as np
+    from scipy.optimize import linprog
+    from scipy.sparse import coo_matrix
+
+    prepared, tautologies = _prepare(clauses)
+    if not prepared:
+        return len(clauses)
+    rows, columns, values = [], [], []
+    upper = np.zeros(len(prepared))
+    for index, clause in enumerate(prepared):
+        rows.append(index)
+        columns.append(num_vars + index)
+        values.append(1.0)
+        for literal in clause:
+            rows.append(index)
+            columns.append(abs(literal) - 1)
+            values.append(-1.0 if literal > 0 else 1.0)
+            if literal < 0:
+                upper[index] += 1
+    constraints = coo_matrix((values, (rows, columns)), shape=(len(prepared), num_vars + len(prepared))).tocsr()
+    objective = np.concatenate([np.zeros(num_vars), -np.ones(len(prepared))])
+    result = linprog(objective, A_ub=constraints, b_ub=upper, bounds=(0, 1), method='highs')
+    if result.status != 0:
+        return len(clauses)
+    return min(len(clauses), int(np.floor(-result.fun + 1e-6)) + tautologies)
+
+
+def upper_bound(num_vars, clauses, method='cores'):
+    """Returns an upper bound on the clauses any assignment satisfies.
+
+    Args:
+        num_vars: The number of variables.
+        clauses: A list of clauses.
+        method: One of `BOUND_METHODS`.
+    """
+    if method not in BOUND_METHODS:
+        raise ValueError(f"unknown bound method {method!r}; choose from {', '.join(BOUND_METHODS)}")
+    bound = len(clauses)
+    if method in ('cores', 'both'):
+        bound = min(bound, core_bound(num_vars, clauses)[0])
+    if method in ('lp', 'both'):
+        bound = min(bound, lp_bound(num_vars, clauses))
+    return bound
@@ -0,0 +1,81 @@
+"""Bucketed priority structure over variable flip scores.
+
+Variables are kept in one bucket per score, each bucket an unordered list
+with every variable's position recorded, so moving a variable to another
+bucket is a swap-remove and an append. The highest non-empty bucket is
+tracked as scores change, so the best flip (with random tie-breaking) is
+found without scanning all variables.
+"""
+
+
+class ScoreBuckets:
+    """Variables bucketed by integer score.
+
+    Args:
+        scores: Initial score of every variable, indexed by variable.
+        bound: Largest absolute score any variable can reach, e.g. the
+            largest number of occurrences of one variable.
+    """
+
+    def __init__(self, scores, bound):
+        self.bound = bound
+        self.buckets = [[] for _ in range(2 * bound + 1)]
+        self.scores = list(scores)
+        self.position = [0] * len(self.scores)
+        for var, score in enumerate(self.scores):
+            bucket = self.buckets[score + bound]
+            self.position[var] = len(bucket)
+            bucket.append(var)
+        self.top = max(self.scores, default=-bound)
+
+    def best_score(self):
+        """Returns the highest score of any variable."""
+        return self.top
+
+    def update(self, var, score):
+        """Moves `var` to the bucket of its new score in O(1)."""
+        old = self.scores[var]
+        if score == old:
+            return
+        bucket = self.buckets[old + self.bound]
+        last = bucket.pop()
+        if last != var:
+            index = self.position[var]
+            bucket[index] = last
+            self.position[last] = index
+
+        bucket = self.buckets[score + self.bound]
+        self.position[var] = len(bucket)
+        bucket.append(var)
+        self.scores[var] = score
+
+        if score > self.top:
+            self.top = score
+        else:
+            while not self.buckets[self.top + self.bound]:
+                self.top -= 1
+
+    def pick_best(self, random):
+        """Returns a uniformly random variable among those with the best score."""
+        bucket = self.buckets[self.top + self.bound]
+        return bucket[random.randrange(len(bucket))]
+
+    def descending(self, random):
+        """Yields (score, variable) from the best score down.
+
+        Each bucket is visited from a random starting position, so ties are
+        broken randomly. Only the buckets actually consumed are touched.
+        """
+        for score in range(self.top, -self.bound - 1, -1):
+            bucket = self.buckets[score + self.bound]
+            if not bucket:
+                continue
+            start = random.randrange(len(bucket))
+            for index in range(len(bucket)):
+                yield score, bucket[(start + index) % len(bucket)]
+
+
+def buckets_for(state):
+    """Returns the `ScoreBuckets` of the current scores of a `FlipState`."""
+    bound = max((len(occurrences) for occurrences in state.occurrences), default=0)
+    return ScoreBuckets([state.score(var) for var in range(state.num_vars)], bound)
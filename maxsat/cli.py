@@ -0,0 +1,237 @@
+"""Command-line entry point: ``python -m maxsat``.
+
+    python -m maxsat run msnahc uf250-01.cnf --runs 30 --seed 1 -p max_evaluations=200000
+    python -m maxsat batch jobs.jsonl --workers 8
+    python -m maxsat batch jobs.jsonl --listen 0.0.0.0:7700 --token SECRET
+    python -m maxsat worker coordinator-host:7700 --processes 8 --token SECRET
+    python -m maxsat tune tabu uf100-01.cnf -s max_failures=[50,100,200] -s sample_size=[25,50] --budget 600
+    python -m maxsat count "Assignment1/uf100-0430.cnf" --models 5
+    python -m maxsat list
+
+Progress is streamed to stdout as one JSON object per line (see
+`maxsat.jobs.run_jobs` for the events). The exit status is 0 when every run
+succeeded, 1 when some runs failed and 2 for invalid arguments or job files.
+"""
+import argparse
+import itertools
+import json
+import time
+
+from maxsat import report
+from maxsat.algorithms import ALGORITHMS, default_params
+from maxsat.bounds import BOUND_METHODS
+from maxsat.jobs import normalise_job, read_job_file, run_jobs
+from maxsat.profiling import PROFILE_MODES
+from maxsat.tuning import race
+
+EXIT_OK = 0
+EXIT_FAILED_RUNS = 1
+EXIT_USAGE = 2
+
+
+def emit(event):
+    print(json.dumps(event), flush=True)
+
+
+def parse_param(text):
+    """Parses NAME=VALUE, reading VALUE as JSON when possible."""
+    name, separator, value = text.partition('=')
+    if not separator:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m maxsat', description="Run MAXSAT metaheuristics.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run one algorithm on one or more instances")
+    run.add_argument('algorithm', choices=sorted(ALGORITHMS))
+    run.add_argument('instances', nargs='+', metavar='instance', help="DIMACS or compiled (.npz) file")
+    run.add_argument('--runs', type=int, default=30, help="independent runs per instance (default 30)")
+    run.add_argument('--seed', type=int, help="root seed; drawn and reported when omitted")
+    run.add_argument('-p', '--param', type=parse_param, action='append', default=[], metavar='NAME=VALUE',
+                     help="algorithm parameter (repeatable); see 'list'")
+    run.add_argument('--preprocess', action='store_true', help="simplify instances before searching")
+    run.add_argument('--reorder', action='store_true', help="renumber instances for memory locality before searching")
+    run.add_argument('--bound', choices=BOUND_METHODS,
+                     help="report the gap to an upper bound and stop runs that reach it")
+    run.add_argument('--results', help="append run records here and skip runs already stored")
+    run.add_argument('--elite-pool', type=int, default=0, metavar='SLOTS',
+                     help="share an elite pool of SLOTS solutions per run between the runs")
+
+    batch = commands.add_parser('batch', help="run the jobs of a JSON Lines job file")
+    batch.add_argument('job_file')
+
+    for command in (run, batch):
+        command.add_argument('--workers', type=int, default=1, help="worker processes (default 1)")
+        command.add_argument('--stats', action='store_true', help="Kruskal-Wallis test over groups of runs")
+        command.add_argument('--plot', metavar='DIR', help="save fitness and trace plots to DIR")
+        command.add_argument('--metrics-port', type=int, metavar='PORT',
+                             help="serve live progress as JSON on 127.0.0.1:PORT/metrics (0 picks a port)")
+        command.add_argument('--metrics-socket', metavar='PATH', help="serve live progress on a Unix socket")
+        command.add_argument('--listen', metavar='HOST:PORT',
+                             help="hand the runs out to 'worker' processes connecting here instead of running them")
+        command.add_argument('--token', help="shared secret of the coordinator and its workers")
+
+    run.add_argument('--profile', metavar='DIR', help="save profiles of each run's search phase to DIR")
+    run.add_argument('--profile-mode', choices=PROFILE_MODES, default='both',
+                     help="cProfile, stack sampling or both (default)")
+
+    tune = commands.add_parser('tune', help="race parameter configurations and report the best")
+    tune.add_argument('algorithm', choices=sorted(ALGORITHMS))
+    tune.add_argument('instances', nargs='+', metavar='instance', help="DIMACS or compiled (.npz) file")
+    tune.add_argument('-s', '--space', type=parse_param, action='append', default=[], metavar='NAME=[VALUES]',
+                      help="candidate values of a parameter as a JSON list (repeatable)")
+    tune.add_argument('-p', '--param', type=parse_param, action='append', default=[], metavar='NAME=VALUE',
+                      help="parameter fixed for every configuration (repeatable)")
+    tune.add_argument('--budget', type=float, default=600, help="CPU seconds for all runs (default 600)")
+    tune.add_argument('--workers', type=int, default=1, help="worker processes (default 1)")
+    tune.add_argument('--seed', type=int, help="root seed; drawn and reported when omitted")
+    tune.add_argument('--max-blocks', type=int, default=60, help="most (instance, run) blocks per configuration")
+    tune.add_argument('--first-test', type=int, default=5, help="blocks before the first elimination test")
+    tune.add_argument('--alpha', type=float, default=0.05, help="significance level (default 0.05)")
+    tune.add_argument('--max-configs', type=int, help="race a random sample of this many configurations")
+    tune.add_argument('--preprocess', action='store_true', help="simplify instances before searching")
+
+    worker = commands.add_parser('worker', help="run the runs of a coordinator started with --listen")
+    worker.add_argument('address', metavar='HOST:PORT')
+    worker.add_argument('--processes', type=int, default=1, help="runs in parallel (default 1)")
+    worker.add_argument('--token', help="shared secret of the coordinator")
+    worker.add_argument('--connect-timeout', type=float, default=60,
+                        help="seconds to keep retrying the coordinator (default 60)")
+
+    count = commands.add_parser('count', help="count the models of instances exactly")
+    count.add_argument('instances', nargs='+', metavar='instance', help="DIMACS or compiled (.npz) file")
+    count.add_argument('--models', type=int, default=0, metavar='N', help="also list the first N models")
+    count.add_argument('--cache-mb', type=float, default=64, help="component cache budget (default 64)")
+
+    commands.add_parser('list', help="list algorithms and their default parameters")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for name in ALGORITHMS:
+            print(f"{name}: {json.dumps(default_params(name))}")
+        return EXIT_OK
+
+    if args.command == 'tune':
+        return tune(parser, args)
+
+    if args.command == 'count':
+        return count(parser, args)
+
+    if args.command == 'worker':
+        from maxsat.distributed import parse_address, serve
+
+        if args.processes < 1:
+            parser.error("--processes must be at least 1")
+        try:
+            address = parse_address(args.address)
+        except ValueError:
+            parser.error(f"expected HOST:PORT, got {args.address!r}")
+        try:
+            serve(address, args.processes, args.token, args.connect_timeout)
+        except OSError as error:
+            parser.exit(EXIT_FAILED_RUNS, f"{parser.prog}: error: {error}\n")
+        return EXIT_OK
+
+    try:
+        if args.command == 'run':
+            jobs = [
+                normalise_job({
+                    'algorithm': args.algorithm,
+                    'instance': instance,
+                    'runs': args.runs,
+                    'seed': args.seed,
+                    'params': dict(args.param),
+                    'preprocess': args.preprocess,
+                    'reorder': args.reorder,
+                    'bound': args.bound,
+                    'results': args.results,
+                    'elite_pool': args.elite_pool,
+                    'profile': args.profile,
+                    'profile_mode': args.profile_mode,
+                })
+                for instance in args.instances
+            ]
+        else:
+            jobs = read_job_file(args.job_file)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if args.listen is not None:
+        from maxsat.distributed import Coordinator, parse_address
+
+        if args.metrics_port is not None or args.metrics_socket is not None:
+            parser.error("--listen cannot be combined with a metrics endpoint")
+        try:
+            host, port = parse_address(args.listen)
+            coordinator = Coordinator(jobs, host, port, args.token, emit)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+        records, failed = coordinator.run()
+    elif args.metrics_port is None and args.metrics_socket is None:
+        records, failed = run_jobs(jobs, args.workers, emit)
+    else:
+        from maxsat.metrics import MetricsServer
+
+        with MetricsServer(args.workers, port=args.metrics_port, socket_path=args.metrics_socket) as metrics:
+            emit({'event': 'metrics', 'address': metrics.address})
+            records, failed = run_jobs(jobs, args.workers, emit, metrics)
+
+    for index, (job, job_records) in enumerate(zip(jobs, records)):
+        if args.stats:
+            result = report.kruskal_groups([record['metrics']['best_fitness'] for record in job_records])
+            if result is not None:
+                emit({'event': 'stats', 'job': index, 'test': 'kruskal', 'statistic': result[0], 'p_value': result[1]})
+        if args.plot and job_records:
+            emit({'event': 'plots', 'job': index, 'files': report.plot_runs(job_records, args.plot, f"job{index}-{job['algorithm']}")})
+
+    return EXIT_FAILED_RUNS if failed else EXIT_OK
+
+
+def tune(parser, args):
+    space = dict(args.space)
+    for name, values in space.items():
+        if not isinstance(values, list) or not values:
+            parser.error(f"-s {name} needs a non-empty JSON list of values")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    try:
+        race(args.algorithm, args.instances, space, args.budget, workers=args.workers, seed=args.seed,
+             fixed=dict(args.param), max_blocks=args.max_blocks, first_test=args.first_test, alpha=args.alpha,
+             max_configs=args.max_configs, preprocess=args.preprocess, emit=emit)
+    except ValueError as error:
+        parser.error(str(error))
+    return EXIT_OK
+
+
+def count(parser, args):
+    from maxsat.compiled import load_instance
+    from maxsat.counting import ModelCounter, iter_models
+    from maxsat.results import pack_assignment
+
+    for instance in args.instances:
+        try:
+            num_vars, clauses = load_instance(instance)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+        counter = ModelCounter(args.cache_mb)
+        start_time = time.time()
+        models = counter.count(num_vars, clauses)
+        emit({'event': 'count', 'instance': instance, 'num_vars': num_vars, 'num_clauses': len(clauses),
+              'models': models, 'decisions': counter.decisions, 'cache': counter.cache.stats(),
+              'time': time.time() - start_time})
+        for index, model in enumerate(itertools.islice(iter_models(num_vars, clauses), args.models)):
+            emit({'event': 'model', 'instance': instance, 'model': index, 'assignment': pack_assignment(model)})
+    return EXIT_OK
@@ -0,0 +1,90 @@
+"""Flat-array ("compiled") form of a CNF instance.
+
+A formula is stored as one int32 array holding every literal of every clause
+back to back and an int64 array of clause start offsets (``offsets[j]`` to
+``offsets[j + 1]`` is clause j). It is saved as an uncompressed ``.npz`` file,
+which loads orders of magnitude faster than parsing DIMACS text.
+"""
+import numpy as np
+
+from maxsat.dimacs import read_dimacs
+
+
+def compile_clauses(clauses):
+    """Returns the (literals, offsets) arrays of a clause list."""
+    lengths = np.fromiter((len(clause) for clause in clauses), dtype=np.int64, count=len(clauses))
+    offsets = np.zeros(len(clauses) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    literals = np.fromiter((literal for clause in clauses for literal in clause), dtype=np.int32, count=int(offsets[-1]))
+    return literals, offsets
+
+
+def compile_matrix(matrix):
+    """Returns the (literals, offsets) arrays of a fixed-width (m, k) literal matrix."""
+    num_clauses, k = matrix.shape
+    return (np.ascontiguousarray(matrix, dtype=np.int32).ravel(),
+            np.arange(0, num_clauses * k + 1, k, dtype=np.int64))
+
+
+def decompile(literals, offsets):
+    """Returns the clause list of compiled arrays."""
+    return [clause.tolist() for clause in np.split(literals, offsets[1:-1])]
+
+
+def save_compiled(filename, num_vars, literals, offsets):
+    """Writes compiled arrays to an ``.npz`` file."""
+    np.savez(filename, num_vars=np.int64(num_vars), literals=literals, offsets=offsets)
+
+
+def load_compiled(filename):
+    """Reads an ``.npz`` file written by `save_compiled`.
+
+    Returns:
+        A tuple containing the number of variables, the literals and the offsets.
+    """
+    with np.load(filename) as data:
+        return int(data['num_vars']), data['literals'], data['offsets']
+
+
+def load_instance(filename):
+    """Reads a DIMACS or compiled (``.npz``) instance as (num_vars, clauses)."""
+    if filename.endswith('.npz'):
+        num_vars, literals, offsets = load_compiled(filename)
+        return num_vars, decompile(literals, offsets)
+    return read_dimacs(filename)
+
+
+def evaluate_compiled(solution, literals, offsets):
+    """Returns the number of clauses satisfied by a 0/1 assignment array."""
+    values = np.asarray(solution, dtype=bool)[np.abs(literals) - 1] == (literals > 0)
+    # reduceat gives an empty clause its neighbour's first literal (or fails
+    # on a trailing one), so only non-empty clauses are reduced; empty ones
+    # are never satisfied.
+    starts = offsets[:-1][offsets[:-1] < offsets[1:]]
+    return int(np.logical_or.reduceat(values, starts).sum())
+
+
+def occurrence_matrix(num_vars, literals, offsets):
+    """Pads the occurrences of every variable into fixed-width rows.
+
+    Returns:
+        A tuple of an (num_vars, width) int32 matrix of clause indices and a
+        matching bool matrix that is True where the variable occurs
+        positively. Unused cells point at the extra clause index
+        ``len(offsets) - 1`` so callers can give it a neutral value.
+    """
+    num_clauses = len(offsets) - 1
+    clause_ids = np.repeat(np.arange(num_clauses, dtype=np.int32), np.diff(offsets))
+    variables = np.abs(literals) - 1
+    order = np.argsort(variables, kind='stable')
+    counts = np.bincount(variables, minlength=num_vars)
+    starts = np.zeros(num_vars + 1, dtype=np.int64)
+    np.cumsum(counts, out=starts[1:])
+    columns = np.arange(len(literals)) - np.repeat(starts[:-1], counts)
+
+    width = int(counts.max(initial=0))
+    clauses = np.full((num_vars, width), num_clauses, dtype=np.int32)
+    positive = np.zeros((num_vars, width), dtype=bool)
+    clauses[variables[order], columns] = clause_ids[order]
+    positive[variables[order], columns] = literals[order] > 0
+    return clauses, positive
@@ -0,0 +1,256 @@
+"""Exact model counting (#SAT) and lazy model enumeration.
+
+`count_models` is a DPLL counter with component decomposition. After every
+decision the formula is simplified by unit propagation, and the remaining
+clauses are split into connected components (clauses linked by shared
+variables). Components share no variables, so they are counted independently
+and their counts multiplied, and every variable no clause mentions any more
+doubles the count. Component counts are cached under their clause set, so a
+sub-formula reached again by other decisions is counted once. The cache is an
+LRU bounded by an estimate of its memory. Counts are Python ints, exact at
+any size.
+
+`iter_models` yields the models one at a time, in the order of the brute-force
+enumeration in Assignment 1, without ever holding more than one.
+"""
+import itertools
+import sys
+from collections import Counter, OrderedDict
+
+# Estimated bytes of a cache entry and of each of its clauses (the frozenset
+# slot and a tuple of small ints).
+ENTRY_BYTES = 240
+CLAUSE_BYTES = 96
+
+
+class ComponentCache:
+    """Least-recently-used map from component clause sets to model counts.
+
+    Args:
+        max_bytes: Estimated memory ceiling of the entries.
+    """
+
+    def __init__(self, max_bytes=64 << 20):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Returns the count of component `key`, or None."""
+        count = self.entries.get(key)
+        if count is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return count
+
+    def put(self, key, count):
+        """Stores a count, evicting the least recently used entries beyond the budget."""
+        self.entries[key] = count
+        self.bytes += ENTRY_BYTES + CLAUSE_BYTES * len(key)
+        while self.bytes > self.max_bytes and self.entries:
+            evicted, _ = self.entries.popitem(last=False)
+            self.bytes -= ENTRY_BYTES + CLAUSE_BYTES * len(evicted)
+            self.evictions += 1
+
+    def stats(self):
+        """Returns hit/miss counters and the cache's size."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self.entries),
+            'evictions': self.evictions,
+            'bytes': self.bytes,
+        }
+
+
+def _prepare(clauses):
+    """Returns the distinct clauses as sorted literal tuples, without repeats or tautologies."""
+    prepared = set()
+    for clause in clauses:
+        literals = set(clause)
+        if not any(-literal in literals for literal in literals):
+            prepared.add(tuple(sorted(literals)))
+    return list(prepared)
+
+
+def _simplify(clauses, literals):
+    """Makes `literals` true and propagates unit clauses.
+
+    Returns:
+        A tuple of the remaining clauses and every literal made true, or None
+        if a clause became empty.
+    """
+    forced = []
+    pending = set(literals)
+    while pending:
+        if any(-literal in pending for literal in pending):
+            return None
+        forced.extend(pending)
+        false = {-literal for literal in pending}
+        remaining = []
+        units = set()
+        for clause in clauses:
+            if not pending.isdisjoint(clause):
+                continue
+            if not false.isdisjoint(clause):
+                clause = tuple(literal for literal in clause if literal not in false)
+                if not clause:
+                    return None
+                if len(clause) == 1:
+                    units.add(clause[0])
+            remaining.append(clause)
+        clauses = remaining
+        pending = units
+    return clauses, forced
+
+
+def _components(clauses):
+    """Splits clauses into groups sharing no variables.
+
+    Returns:
+        A list of (clauses, number of variables) pairs.
+    """
+    parent = {}
+
+    def find(var):
+        root = var
+        while parent[root] != root:
+            root = parent[root]
+        while parent[var] != root:
+            parent[var], var = root, parent[var]
+        return root
+
+    for clause in clauses:
+        first = find(parent.setdefault(abs(clause[0]), abs(clause[0])))
+        for literal in clause[1:]:
+            other = find(parent.setdefault(abs(literal), abs(literal)))
+            if other != first:
+                parent[other] = first
+
+    groups = {}
+    for clause in clauses:
+        groups.setdefault(find(abs(clause[0])), []).append(clause)
+    sizes = Counter(find(var) for var in parent)
+    return [(group, sizes[root]) for root, group in groups.items()]
+
+
+class ModelCounter:
+    """Counts models with a component cache that persists between calls.
+
+    Args:
+        cache_mb: Memory budget of the component cache in megabytes.
+    """
+
+    def __init__(self, cache_mb=64):
+        self.cache = ComponentCache(int(cache_mb * (1 << 20)))
+        self.decisions = 0
+
+    def count(self, num_vars, clauses):
+        """Returns the number of assignments of `num_vars` variables satisfying every clause."""
+        clauses = _prepare(clauses)
+        if any(not clause for clause in clauses):
+            return 0
+        simplified = _simplify(clauses, [clause[0] for clause in clauses if len(clause) == 1])
+        if simplified is None:
+            return 0
+        remaining, forced = simplified
+        components = _components(remaining)
+        free = num_vars - len(forced) - sum(size for _, size in components)
+
+        # Every decision adds a frame or two; deep formulas need a deeper stack.
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * num_vars + 1000))
+        count = 2 ** free
+        for component, size in components:
+            count *= self._count(component, size)
+            if not count:
+                break
+        return count
+
+    def _count(self, clauses, num_vars):
+        key = frozenset(clauses)
+        count = self.cache.get(key)
+        if count is not None:
+            return count
+
+        # Branch on the variable occurring most often; it splits the most clauses.
+        occurrences = Counter(abs(literal) for clause in clauses for literal in clause)
+        var = max(occurrences, key=occurrences.__getitem__)
+        count = 0
+        for literal in (var, -var):
+            self.decisions += 1
+            simplified = _simplify(clauses, [literal])
+            if simplified is None:
+                continue
+            remaining, forced = simplified
+            components = _components(remaining)
+            branch = 2 ** (num_vars - len(forced) - sum(size for _, size in components))
+            for component, size in components:
+                branch *= self._count(component, size)
+                if not branch:
+                    break
+            count += branch
+
+        self.cache.put(key, count)
+        return count
+
+
+def count_models(num_vars, clauses, cache_mb=64):
+    """Returns the exact number of models of a CNF formula.
+
+    Args:
+        num_vars: The number of variables; ones no clause mentions are free.
+        clauses: A list of clauses.
+        cache_mb: Memory budget of the component cache in megabytes.
+    """
+    return ModelCounter(cache_mb).count(num_vars, clauses)
+
+
+def _models(clauses, values, num_vars):
+    # Depth-first over an explicit stack rather than recursion, which would
+    # go one frame deeper per decision. A pending branch is (clauses, values,
+    # literal to make true, or None once applied); True is pushed under False
+    # so the False branch comes out first.
+    stack = [(clauses, values, None)]
+    while stack:
+        clauses, values, literal = stack.pop()
+        if literal is not None:
+            simplified = _simplify(clauses, [literal])
+            if simplified is None:
+                continue
+            clauses, forced = simplified
+            values = values | {abs(forced_literal): forced_literal > 0 for forced_literal in forced}
+        unassigned = [var for var in range(1, num_vars + 1) if var not in values]
+        if not clauses:
+            for bits in itertools.product((False, True), repeat=len(unassigned)):
+                model = dict(values)
+                model.update(zip(unassigned, bits))
+                yield tuple(model[var] for var in range(1, num_vars + 1))
+            continue
+        var = unassigned[0]
+        stack.append((clauses, values, var))
+        stack.append((clauses, values, -var))
+
+
+def iter_models(num_vars, clauses):
+    """Yields every model as a tuple of bools (variable 1 first).
+
+    Models come in lexicographic order with False before True, the order of
+    ``itertools.product([False, True], repeat=num_vars)``: the search always
+    branches on the lowest unassigned variable, and unit propagation only
+    prunes branches without models.
+    """
+    clauses = _prepare(clauses)
+    if any(not clause for clause in clauses):
+        return
+    simplified = _simplify(clauses, [clause[0] for clause in clauses if len(clause) == 1])
+    if simplified is None:
+        return
+    remaining, forced = simplified
+    yield from _models(remaining, {abs(literal): literal > 0 for literal in forced}, num_vars)
@@ -0,0 +1,58 @@
+"""Reading and writing DIMACS CNF files."""
+
+
+def read_dimacs(filename):
+    """Reads a DIMACS file and returns the number of variables and the clause list.
+
+    Args:
+        filename: The name of the DIMACS file.
+
+    Returns:
+        A tuple containing the number of variables and a list of clauses.
+    """
+
+    with open(filename, 'r') as file:
+        dimacs_content = file.readlines()
+
+    clauses = []
+    num_vars = None
+    num_clauses = None
+
+    for line in dimacs_content:
+        line = line.strip()
+
+        # Skip comments, empty lines, '%' or '0'
+        if line.startswith('c') or line == '' or line.startswith('%') or line.startswith('0'):
+            continue
+
+        # Parse 'p' line to get number of variables and clauses
+        if line.startswith('p'):
+            _, _, num_vars, num_clauses = line.split()
+            num_vars = int(num_vars)
+            num_clauses = int(num_clauses)
+            continue
+
+        clause = list(map(int, line.split()[:-1]))
+        clauses.append(clause)
+
+    assert len(clauses) == num_clauses, f"Expected {num_clauses} clauses but got {len(clauses)}"
+
+    return num_vars, clauses
+
+
+def write_dimacs(filename, num_vars, clauses, comments=()):
+    """Writes clauses to a DIMACS file.
+
+    Args:
+        filename: The name of the DIMACS file.
+        num_vars: The number of variables.
+        clauses: A list of clauses.
+        comments: Lines written as 'c' comments before the header.
+    """
+
+    with open(filename, 'w') as file:
+        for comment in comments:
+            file.write(f"c {comment}\n")
+        file.write(f"p cnf {num_vars} {len(clauses)}\n")
+        for clause in clauses:
+            file.write(' '.join(map(str, clause)) + ' 0\n')
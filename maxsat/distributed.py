@@ -0,0 +1,278 @@
+"""Runs the jobs of a batch on worker processes of other machines over TCP.
+
+A coordinator owns the batch (see `maxsat.jobs.Batch`): it resumes it from
+the result stores, hands out runs and records the results. Workers connect to
+it, run whatever they are given with `maxsat.jobs.run_task` and send the
+records back. Every message is one JSON object per line:
+
+    worker -> coordinator   {"type": "hello", "worker": NAME, "token": TOKEN}
+                            {"type": "result", "task": ID, "record": RECORD}
+                            {"type": "error", "task": ID, "error": TEXT}
+                            {"type": "heartbeat"}
+    coordinator -> worker   {"type": "task", "task": ID, "job": JOB, "run": RUN, "job_index": INDEX}
+                            {"type": "done"}
+
+Each connection has up to `PREFETCH` runs assigned, so a worker never waits
+for a round trip between runs. A worker that disconnects, or sends nothing
+(not even a heartbeat) for `heartbeat_timeout` seconds, is considered lost.
+Its runs go back to the front of the queue, and a run that has lost
+`MAX_ATTEMPTS` workers is recorded as failed. A run can therefore finish
+twice; only the first result is kept.
+
+Workers open instance files by the paths in the jobs, so every host needs
+the instances at the same paths (e.g. the same checkout). The protocol has
+no encryption: listen on a trusted network and set a token.
+"""
+import json
+import multiprocessing
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+
+from maxsat.jobs import Batch, run_task
+
+PREFETCH = 2
+MAX_ATTEMPTS = 3
+HEARTBEAT_INTERVAL = 5.0
+HEARTBEAT_TIMEOUT = 30.0
+
+
+def parse_address(text):
+    """Parses HOST:PORT (or just PORT, on 127.0.0.1)."""
+    host, separator, port = text.rpartition(':')
+    return (host if separator else '127.0.0.1'), int(port)
+
+
+def _send(sock, message, lock=None):
+    data = (json.dumps(message) + '\n').encode()
+    if lock is None:
+        sock.sendall(data)
+    else:
+        with lock:
+            sock.sendall(data)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        coordinator = self.server.coordinator
+        self.request.settimeout(coordinator.heartbeat_timeout)
+        try:
+            hello = json.loads(self.rfile.readline())
+        except (OSError, ValueError):
+            return
+        if hello.get('type') != 'hello' or hello.get('token') != coordinator.token:
+            _send(self.request, {'type': 'done', 'error': 'bad handshake'})
+            return
+        name = hello.get('worker') or f"{self.client_address[0]}:{self.client_address[1]}"
+        coordinator.events.put(('emit', {'event': 'worker', 'worker': name, 'status': 'connected'}))
+
+        assigned = {}
+        try:
+            while True:
+                tasks = coordinator.take(PREFETCH - len(assigned), wait=not assigned)
+                if tasks is None:
+                    _send(self.request, {'type': 'done'})
+                    return
+                for task_id, index, run in tasks:
+                    assigned[task_id] = (index, run)
+                    _send(self.request, {'type': 'task', 'task': task_id, 'job': coordinator.jobs[index],
+                                         'run': run, 'job_index': index})
+                    coordinator.events.put(('emit', {'event': 'start', 'job': index, 'run': run, 'worker': name}))
+                if not assigned:
+                    continue
+
+                line = self.rfile.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if message.get('type') in ('result', 'error') and message.get('task') in assigned:
+                    index, run = assigned.pop(message['task'])
+                    coordinator.events.put((message['type'], index, run, message.get('record') or message.get('error')))
+        except (OSError, ValueError):
+            pass
+        finally:
+            if assigned:
+                coordinator.requeue(assigned.values())
+                coordinator.events.put(('emit', {'event': 'worker', 'worker': name, 'status': 'lost',
+                                                 'requeued': len(assigned)}))
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Coordinator:
+    """Serves the runs of `jobs` to remote workers.
+
+    Args:
+        jobs: Normalised job specs (see `maxsat.jobs.normalise_job`).
+        host: Interface to listen on; 0.0.0.0 for other machines.
+        port: TCP port; 0 picks a free one (see `address`).
+        token: Shared secret workers must present.
+        emit: Called with the events of `maxsat.jobs.run_jobs`, plus worker
+            connect and loss events.
+        heartbeat_timeout: Seconds of silence after which a worker is lost.
+
+    Raises:
+        ValueError: If a job shares an elite pool, which needs shared memory.
+    """
+
+    def __init__(self, jobs, host='127.0.0.1', port=0, token=None, emit=print, heartbeat_timeout=HEARTBEAT_TIMEOUT):
+        if any(job['elite_pool'] for job in jobs):
+            raise ValueError("elite pools cannot be shared between hosts")
+        self.jobs = jobs
+        self.token = token
+        self.emit = emit
+        self.heartbeat_timeout = heartbeat_timeout
+        self.events = queue.Queue()
+        self.batch = Batch(jobs, emit)
+        self.finished = set()
+        self.attempts = {}
+        self.next_task = 0
+        self.closing = False
+        self.condition = threading.Condition()
+        self.server = _Server((host, port), _Handler)
+        self.server.coordinator = self
+        self.address = self.server.server_address
+
+    def take(self, count, wait):
+        """Returns up to `count` (task id, job index, run) tuples for a connection.
+
+        With `wait`, blocks until there is at least one. Returns None once the
+        batch is complete.
+        """
+        with self.condition:
+            while True:
+                if self.closing:
+                    return None
+                tasks = []
+                pending = self.batch.pending
+                while pending and len(tasks) < count:
+                    index, run = pending.popleft()
+                    if (index, run) in self.finished:
+                        continue
+                    self.attempts[index, run] = self.attempts.get((index, run), 0) + 1
+                    tasks.append((self.next_task, index, run))
+                    self.next_task += 1
+                if tasks or not wait:
+                    return tasks
+                self.condition.wait()
+
+    def requeue(self, runs):
+        """Puts the unfinished runs of a lost worker back at the front of the queue."""
+        with self.condition:
+            for index, run in runs:
+                if (index, run) in self.finished:
+                    continue
+                if self.attempts[index, run] >= MAX_ATTEMPTS:
+                    self.events.put(('error', index, run, f"lost {MAX_ATTEMPTS} workers while running"))
+                else:
+                    self.batch.pending.appendleft((index, run))
+            self.condition.notify_all()
+
+    def run(self):
+        """Serves until every run has a result and returns them like `run_jobs`."""
+        thread = threading.Thread(target=self.server.serve_forever, name='coordinator', daemon=True)
+        thread.start()
+        host, port = self.address
+        self.emit({'event': 'listening', 'address': f"{host}:{port}", 'runs': len(self.batch.pending)})
+        try:
+            while sum(self.batch.remaining):
+                kind, *details = self.events.get()
+                if kind == 'emit':
+                    self.emit(details[0])
+                    continue
+                index, run, outcome = details
+                with self.condition:
+                    if (index, run) in self.finished:
+                        continue
+                    self.finished.add((index, run))
+                if kind == 'error':
+                    outcome = RuntimeError(outcome)
+                self.batch.finish(index, run, outcome)
+        finally:
+            with self.condition:
+                self.closing = True
+                self.condition.notify_all()
+            self.server.shutdown()
+            self.server.server_close()
+        return self.batch.results()
+
+
+def _connect(address, timeout):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return socket.create_connection(address)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.5)
+
+
+def work(address, token=None, name=None, connect_timeout=60.0):
+    """Runs tasks from the coordinator at `address` until it says it is done.
+
+    Args:
+        address: (host, port) of the coordinator.
+        token: Shared secret of the coordinator.
+        name: Name reported to the coordinator; host and pid by default.
+        connect_timeout: Seconds to keep retrying the first connection.
+
+    Returns:
+        The number of runs completed.
+
+    Raises:
+        ConnectionRefusedError: If the coordinator rejects the token.
+    """
+    sock = _connect(address, connect_timeout)
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def heartbeat():
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                _send(sock, {'type': 'heartbeat'}, lock)
+            except OSError:
+                return
+
+    completed = 0
+    with sock, sock.makefile('r') as reader:
+        _send(sock, {'type': 'hello', 'worker': name or f"{socket.gethostname()}:{os.getpid()}", 'token': token}, lock)
+        threading.Thread(target=heartbeat, name='heartbeat', daemon=True).start()
+        try:
+            for line in reader:
+                message = json.loads(line)
+                if message['type'] == 'done':
+                    if 'error' in message:
+                        raise ConnectionRefusedError(f"coordinator refused the worker: {message['error']}")
+                    break
+                try:
+                    record = run_task(message['job'], message['run'], job_index=message['job_index'])
+                except Exception as error:
+                    _send(sock, {'type': 'error', 'task': message['task'], 'error': f"{type(error).__name__}: {error}"},
+                          lock)
+                else:
+                    _send(sock, {'type': 'result', 'task': message['task'], 'record': record}, lock)
+                    completed += 1
+        finally:
+            stop.set()
+    return completed
+
+
+def serve(address, processes=1, token=None, connect_timeout=60.0):
+    """Runs `processes` workers for the coordinator at `address` and waits for them."""
+    if processes == 1:
+        work(address, token, connect_timeout=connect_timeout)
+        return
+    workers = [multiprocessing.Process(target=work, args=(address, token, None, connect_timeout))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
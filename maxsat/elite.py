@@ -0,0 +1,304 @@
+"""A bounded, diversity-aware pool of elite solutions shared between workers.
+
+The pool lives in one flat buffer, normally a named
+`multiprocessing.shared_memory` block that every worker process attaches to.
+It is split into one region of slots per writer (one writer per run), and
+only the owner of a region ever writes to it, so publishing needs no lock.
+Each slot is guarded by a sequence counter (a seqlock): the writer makes it
+odd while the slot is being rewritten, and a reader retries until it copies
+the slot between two reads of the same even value. A slot that stays odd
+belongs to a writer that died mid-write; readers skip it after
+`READ_ATTEMPTS` tries.
+
+A solution is only published if no solution in the pool within
+`min_distance` bits of it is at least as good, which keeps the pool from
+filling up with copies of one local optimum. Restarts then walk from the
+current local optimum towards a random elite (path relinking) and start the
+next ascent from the best assignment on that path.
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from maxsat.incremental import FlipState
+
+MAGIC = 0x454c495445  # "ELITE"
+HEADER_FIELDS = 6
+HEADER_BYTES = 8 * HEADER_FIELDS
+# Per slot: sequence counter and fitness, followed by the packed assignment.
+SLOT_HEADER = 2
+# Reads of a slot before it is taken to be torn for good.
+READ_ATTEMPTS = 10000
+
+
+def _layout(num_vars, writers, slots_per_writer):
+    words = SLOT_HEADER + (num_vars + 63) // 64
+    return words, HEADER_BYTES + 8 * words * writers * slots_per_writer
+
+
+class ElitePool:
+    """Elite solutions in a shared buffer; see the module docstring.
+
+    Use `create`, `local` or `attach` rather than the constructor.
+
+    Args:
+        buffer: Writable buffer holding the header and slots.
+        shm: The `SharedMemory` owning `buffer`, if any.
+    """
+
+    def __init__(self, buffer, shm=None):
+        self.shm = shm
+        header = np.frombuffer(buffer, dtype=np.int64, count=HEADER_FIELDS)
+        if header[0] != MAGIC:
+            raise ValueError("buffer does not hold an elite pool")
+        self.num_vars, self.writers, self.slots_per_writer, self.min_distance, words = (int(value) for value in header[1:])
+        slots = self.writers * self.slots_per_writer
+        self.slots = np.frombuffer(buffer, dtype=np.uint64, count=slots * words, offset=HEADER_BYTES).reshape(slots, words)
+        self.fitness = self.slots[:, 1].view(np.int64)
+
+    @staticmethod
+    def _initialise(buffer, num_vars, writers, slots_per_writer, min_distance):
+        words, _ = _layout(num_vars, writers, slots_per_writer)
+        if min_distance is None:
+            min_distance = max(1, num_vars // 20)
+        header = np.frombuffer(buffer, dtype=np.int64, count=HEADER_FIELDS)
+        header[:] = [MAGIC, num_vars, writers, slots_per_writer, min_distance, words]
+        slots = np.frombuffer(buffer, dtype=np.int64, offset=HEADER_BYTES)
+        slots[:] = 0
+        slots.reshape(-1, words)[:, 1] = -1
+
+    @classmethod
+    def create(cls, num_vars, writers, slots_per_writer=4, min_distance=None):
+        """Allocates a pool in a new shared memory block.
+
+        Args:
+            num_vars: Number of variables of the instance.
+            writers: Number of writers (runs) that publish to the pool.
+            slots_per_writer: Solutions each writer may keep in the pool.
+            min_distance: Hamming distance below which two solutions count as
+                the same region; defaults to 5% of the variables.
+        """
+        _, size = _layout(num_vars, writers, slots_per_writer)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        cls._initialise(shm.buf, num_vars, writers, slots_per_writer, min_distance)
+        return cls(shm.buf, shm)
+
+    @classmethod
+    def local(cls, num_vars, writers=1, slots_per_writer=4, min_distance=None):
+        """Allocates a pool in private memory, for single-process use."""
+        _, size = _layout(num_vars, writers, slots_per_writer)
+        buffer = bytearray(size)
+        cls._initialise(buffer, num_vars, writers, slots_per_writer, min_distance)
+        return cls(buffer)
+
+    @classmethod
+    def attach(cls, name):
+        """Attaches to the pool created under shared memory `name`."""
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm.buf, shm)
+
+    @property
+    def name(self):
+        """Name of the shared memory block, or None for a local pool."""
+        return self.shm.name if self.shm is not None else None
+
+    def close(self):
+        """Detaches from the shared memory block."""
+        if self.shm is not None:
+            self.slots = self.fitness = None
+            self.shm.close()
+
+    def unlink(self):
+        """Closes and frees the shared memory block; call once, from its creator."""
+        if self.shm is not None:
+            self.close()
+            self.shm.unlink()
+
+    def _read(self, slot):
+        """Returns a consistent (fitness, packed words) copy of a slot, or None if it stays torn."""
+        row = self.slots[slot]
+        for _ in range(READ_ATTEMPTS):
+            sequence = int(row[0])
+            if sequence & 1:
+                continue
+            fitness = int(row[1].view(np.int64))
+            words = row[SLOT_HEADER:].copy()
+            if int(row[0]) == sequence:
+                return fitness, words
+        return None
+
+    def snapshot(self):
+        """Returns a consistent copy of every filled slot as (fitness, packed words) pairs."""
+        entries = []
+        for slot in np.flatnonzero(self.fitness >= 0):
+            entry = self._read(slot)
+            if entry is not None and entry[0] >= 0:
+                entries.append(entry)
+        return entries
+
+    def writer(self, index):
+        """Returns the handle through which run `index` publishes its solutions."""
+        if not 0 <= index < self.writers:
+            raise ValueError(f"writer {index} out of range for a pool of {self.writers}")
+        return EliteWriter(self, index)
+
+
+def pack_words(solution):
+    """Packs a 0/1 assignment into the uint64 words stored in a pool slot."""
+    bits = np.packbits(np.asarray(solution, dtype=np.uint8))
+    bits = np.concatenate([bits, np.zeros(-len(bits) % 8, dtype=np.uint8)])
+    return bits.view(np.uint64)
+
+
+def unpack_words(words, num_vars):
+    """Inverse of `pack_words`."""
+    return np.unpackbits(words.view(np.uint8))[:num_vars].tolist()
+
+
+def _distances(words, entries):
+    # np.bitwise_count needs numpy 2; unpacking the bytes works on any version.
+    return [int(np.unpackbits((words ^ other).view(np.uint8)).sum()) for _, other in entries]
+
+
+class EliteWriter:
+    """One writer's view of an `ElitePool`: it reads every slot but writes only its own."""
+
+    def __init__(self, pool, index):
+        self.pool = pool
+        self.num_vars = pool.num_vars
+        self.own = range(index * pool.slots_per_writer, (index + 1) * pool.slots_per_writer)
+        self.published = 0
+
+    def snapshot(self):
+        return self.pool.snapshot()
+
+    def publish(self, solution, fitness):
+        """Offers a solution to the pool.
+
+        It is rejected if an elite at least as good lies within the pool's
+        `min_distance`. Otherwise it replaces this writer's worse elite in
+        the same region, an empty slot of this writer, or this writer's worst
+        elite if that is worse, in that order of preference.
+
+        Returns:
+            Whether the solution was stored.
+        """
+        pool = self.pool
+        words = pack_words(solution)
+        slots = []
+        entries = []
+        for slot in np.flatnonzero(pool.fitness >= 0):
+            entry = pool._read(slot)
+            if entry is not None:
+                slots.append(slot)
+                entries.append(entry)
+        target = None
+        for slot, (elite_fitness, _), distance in zip(slots, entries, _distances(words, entries)):
+            if distance < pool.min_distance:
+                if elite_fitness >= fitness:
+                    return False
+                if slot in self.own and target is None:
+                    target = slot
+        if target is None:
+            empty = [slot for slot in self.own if pool.fitness[slot] < 0]
+            if empty:
+                target = empty[0]
+            else:
+                target = min(self.own, key=lambda slot: pool.fitness[slot])
+                if pool.fitness[target] >= fitness:
+                    return False
+
+        row = pool.slots[target]
+        row[0] += np.uint64(1)
+        row[1] = np.int64(fitness).view(np.uint64)
+        row[SLOT_HEADER:] = words
+        row[0] += np.uint64(1)
+        self.published += 1
+        return True
+
+
+def path_relink(state, guide, rng):
+    """Walks a `FlipState` towards `guide`, one best-scoring differing flip at a time.
+
+    Every step flips, among the variables on which the two assignments still
+    differ, one with the highest flip score (ties broken randomly), so the
+    path bends through the best intermediate assignments.
+
+    Returns:
+        A tuple of the best assignment strictly between the endpoints (None
+        if they differ in fewer than two variables), its fitness, and the
+        number of flip scores evaluated.
+    """
+    differing = [var for var in range(state.num_vars) if state.solution[var] != guide[var]]
+    best_solution = None
+    best_fitness = -1
+    evaluations = 0
+    while len(differing) > 1:
+        evaluations += len(differing)
+        scores = [state.score(var) for var in differing]
+        top = max(scores)
+        candidates = [index for index, score in enumerate(scores) if score == top]
+        index = candidates[rng.random.randrange(len(candidates))]
+        var = differing[index]
+        differing[index] = differing[-1]
+        differing.pop()
+        state.flip(var)
+        if state.fitness > best_fitness:
+            best_solution = list(state.solution)
+            best_fitness = state.fitness
+    return best_solution, best_fitness, evaluations
+
+
+class Relinker:
+    """Restart policy of a multistart search sharing an elite pool.
+
+    Args:
+        elite: The run's `EliteWriter`.
+        clauses: A list of clauses.
+        num_vars: The number of variables.
+    """
+
+    def __init__(self, elite, clauses, num_vars):
+        self.elite = elite
+        self.num_vars = num_vars
+        self.state = FlipState(clauses, num_vars, [0] * num_vars)
+        self.relinks = 0
+
+    def restart(self, solution, fitness, rng):
+        """Publishes the local optimum `solution` and returns where to restart.
+
+        Returns:
+            A tuple of the restart assignment (the best point on the path from
+            `solution` to a random elite at least `min_distance` away, or a
+            random assignment if there is none) and the evaluations spent.
+        """
+        self.elite.publish(solution, fitness)
+        words = pack_words(solution)
+        entries = self.elite.snapshot()
+        guides = [entry for entry, distance in zip(entries, _distances(words, entries))
+                  if distance >= self.elite.pool.min_distance]
+        if guides:
+            _, guide = guides[rng.random.randrange(len(guides))]
+            self.state.reset(solution)
+            start, _, evaluations = path_relink(self.state, unpack_words(guide, self.num_vars), rng)
+            if start is not None:
+                self.relinks += 1
+                return start, evaluations
+        return rng.bit_list(self.num_vars), 0
+
+    def stats(self):
+        return {'relinks': self.relinks, 'published': self.elite.published}
+
+
+def relinker_for(elite, elite_size, clauses, num_vars):
+    """Returns the `Relinker` of a run.
+
+    `elite` is the `EliteWriter` the job runner hands a run whose job shares a
+    pool; without one, a positive `elite_size` gives the run a private pool.
+    Returns None when neither is set.
+    """
+    if elite is None:
+        if not elite_size:
+            return None
+        elite = ElitePool.local(num_vars, slots_per_writer=elite_size).writer(0)
+    return Relinker(elite, clauses, num_vars)
@@ -0,0 +1,10 @@
+"""Reference MAXSAT objective shared by the library modules."""
+
+
+def evaluate_fitness(solution, clauses):
+    """Returns the number of clauses satisfied by a 0/1 (or bool) assignment."""
+    satisfied_clauses = 0
+    for clause in clauses:
+        if any((literal > 0 and solution[abs(literal) - 1]) or (literal < 0 and not solution[abs(literal) - 1]) for literal in clause):
+            satisfied_clauses += 1
+    return satisfied_clauses
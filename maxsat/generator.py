@@ -0,0 +1,125 @@
+"""Uniform random and planted k-SAT instance generator.
+
+Clauses are drawn as one (m, k) literal matrix: every clause picks k distinct
+variables uniformly and negates each with probability 1/2, like the uf*
+benchmark files. Planted instances keep only clauses satisfied by a hidden
+random assignment, so they are satisfiable at any clause/variable ratio.
+
+Run as ``python -m maxsat.generator -n 1000000 -r 4.26 out.cnf --compiled out.npz``.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from maxsat.compiled import compile_matrix, save_compiled
+
+# Rows formatted per '%' call when writing DIMACS; bounds the size of the
+# temporary argument tuple.
+WRITE_CHUNK = 1 << 16
+
+
+def _distinct_variables(rng, num_vars, num_clauses, k):
+    variables = rng.integers(1, num_vars + 1, size=(num_clauses, k), dtype=np.int32)
+    while True:
+        ordered = np.sort(variables, axis=1)
+        repeated = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+        if not len(repeated):
+            return variables
+        variables[repeated] = rng.integers(1, num_vars + 1, size=(len(repeated), k), dtype=np.int32)
+
+
+def random_ksat(num_vars, num_clauses, k=3, seed=None):
+    """Generates a uniform random k-SAT formula.
+
+    Args:
+        num_vars: The number of variables.
+        num_clauses: The number of clauses.
+        k: Literals per clause; clauses never repeat a variable.
+        seed: Seed of the numpy generator.
+
+    Returns:
+        An (num_clauses, k) int32 matrix of literals.
+    """
+    if k > num_vars:
+        raise ValueError(f"cannot draw {k} distinct variables out of {num_vars}")
+    rng = np.random.default_rng(seed)
+    variables = _distinct_variables(rng, num_vars, num_clauses, k)
+    signs = rng.integers(0, 2, size=(num_clauses, k), dtype=np.int32) * 2 - 1
+    return variables * signs
+
+
+def planted_ksat(num_vars, num_clauses, k=3, seed=None):
+    """Generates a random k-SAT formula satisfied by a hidden assignment.
+
+    Clauses falsified by the planted assignment are redrawn, so every clause is
+    uniform among the clauses the assignment satisfies.
+
+    Returns:
+        A tuple containing the (num_clauses, k) literal matrix and the planted
+        0/1 assignment.
+    """
+    if k > num_vars:
+        raise ValueError(f"cannot draw {k} distinct variables out of {num_vars}")
+    rng = np.random.default_rng(seed)
+    planted = rng.integers(0, 2, size=num_vars, dtype=np.uint8)
+    matrix = np.empty((num_clauses, k), dtype=np.int32)
+
+    pending = np.arange(num_clauses)
+    while len(pending):
+        variables = _distinct_variables(rng, num_vars, len(pending), k)
+        signs = rng.integers(0, 2, size=variables.shape, dtype=np.int32) * 2 - 1
+        matrix[pending] = variables * signs
+        satisfied = ((planted[variables - 1] == 1) == (signs > 0)).any(axis=1)
+        pending = pending[~satisfied]
+
+    return matrix, planted
+
+
+def write_dimacs_matrix(filename, num_vars, matrix, comments=()):
+    """Writes a fixed-width literal matrix as DIMACS, formatting rows in bulk."""
+    num_clauses, k = matrix.shape
+    row = ' '.join(['%d'] * k) + ' 0\n'
+    with open(filename, 'w') as file:
+        for comment in comments:
+            file.write(f"c {comment}\n")
+        file.write(f"p cnf {num_vars} {num_clauses}\n")
+        for start in range(0, num_clauses, WRITE_CHUNK):
+            chunk = matrix[start:start + WRITE_CHUNK]
+            file.write((row * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a random k-SAT instance.")
+    parser.add_argument('output', help="DIMACS file to write")
+    parser.add_argument('-n', '--num-vars', type=int, required=True)
+    size = parser.add_mutually_exclusive_group(required=True)
+    size.add_argument('-m', '--num-clauses', type=int)
+    size.add_argument('-r', '--ratio', type=float, help="clauses per variable")
+    parser.add_argument('-k', type=int, default=3, help="literals per clause (default 3)")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--planted', action='store_true', help="plant a satisfying assignment")
+    parser.add_argument('--compiled', help="also write the compiled .npz form here")
+    args = parser.parse_args(argv)
+
+    num_clauses = args.num_clauses if args.num_clauses is not None else round(args.ratio * args.num_vars)
+
+    start_time = time.time()
+    if args.planted:
+        matrix, _ = planted_ksat(args.num_vars, num_clauses, args.k, args.seed)
+    else:
+        matrix = random_ksat(args.num_vars, num_clauses, args.k, args.seed)
+    kind = "planted" if args.planted else "uniform"
+    print(f"Generated {kind} {args.k}-SAT with {args.num_vars} variables, {num_clauses} clauses "
+          f"in {time.time() - start_time:.2f} seconds")
+
+    start_time = time.time()
+    write_dimacs_matrix(args.output, args.num_vars, matrix,
+                        comments=[f"{kind} random {args.k}-SAT, seed {args.seed}"])
+    if args.compiled:
+        save_compiled(args.compiled, args.num_vars, *compile_matrix(matrix))
+    print(f"Written in {time.time() - start_time:.2f} seconds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Incremental evaluation of single-variable flips.
+
+`FlipState` keeps, for one assignment, the number of true literals of every
+clause and each variable's make count (unsatisfied clauses its flip would
+satisfy) and break count (clauses in which it is the only true literal). A
+flip touches only the clauses the variable occurs in and returns the
+variables whose score (make - break) changed, so callers can keep priority
+structures such as `maxsat.buckets.ScoreBuckets` in step.
+"""
+
+
+def normalise_clauses(clauses):
+    """Drops repeated literals and tautologies, which the flip updates assume away.
+
+    Returns:
+        A tuple of the remaining clauses and the number of tautologies, which
+        every assignment satisfies.
+    """
+    normalised = []
+    tautologies = 0
+    for clause in clauses:
+        literals = sorted(set(clause), key=abs)
+        if any(-literal in literals for literal in literals):
+            tautologies += 1
+        else:
+            normalised.append(literals)
+    return normalised, tautologies
+
+
+def occurrence_lists(clauses, num_vars):
+    """Returns, for every variable (0-based), its (clause index, is positive) occurrences."""
+    occurrences = [[] for _ in range(num_vars)]
+    for index, clause in enumerate(clauses):
+        for literal in clause:
+            occurrences[abs(literal) - 1].append((index, literal > 0))
+    return occurrences
+
+
+class FlipState:
+    """An assignment with incrementally maintained clause counts and flip scores.
+
+    Args:
+        clauses: A list of clauses.
+        num_vars: The number of variables.
+        solution: Initial 0/1 assignment; it is copied.
+        occurrences: Precomputed `occurrence_lists` of the normalised clauses,
+            shared between states of the same instance.
+    """
+
+    def __init__(self, clauses, num_vars, solution, occurrences=None):
+        self.clauses, self.tautologies = normalise_clauses(clauses)
+        self.num_vars = num_vars
+        self.occurrences = occurrences if occurrences is not None else occurrence_lists(self.clauses, num_vars)
+        self.reset(solution)
+
+    def reset(self, solution):
+        """Replaces the assignment and recomputes all counts from scratch."""
+        self.solution = [int(bool(value)) for value in solution]
+        self.true_count = [0] * len(self.clauses)
+        self.make = [0] * self.num_vars
+        self.brk = [0] * self.num_vars
+
+        satisfied = 0
+        for index, clause in enumerate(self.clauses):
+            true_literals = [literal for literal in clause if self.solution[abs(literal) - 1] == (literal > 0)]
+            self.true_count[index] = len(true_literals)
+            if not true_literals:
+                for literal in clause:
+                    self.make[abs(literal) - 1] += 1
+            else:
+                satisfied += 1
+                if len(true_literals) == 1:
+                    self.brk[abs(true_literals[0]) - 1] += 1
+        self.fitness = satisfied + self.tautologies
+
+    def score(self, var):
+        """Fitness change of flipping 0-based variable `var`."""
+        return self.make[var] - self.brk[var]
+
+    def _sole_true_var(self, index):
+        solution = self.solution
+        for literal in self.clauses[index]:
+            if solution[abs(literal) - 1] == (literal > 0):
+                return abs(literal) - 1
+
+    def flip(self, var):
+        """Flips 0-based variable `var` and updates every count it affects.
+
+        Returns:
+            The variables whose score changed (possibly with repeats).
+        """
+        self.solution[var] ^= 1
+        value = self.solution[var]
+        true_count = self.true_count
+        make = self.make
+        brk = self.brk
+        changed = [var]
+
+        for index, positive in self.occurrences[var]:
+            if positive == bool(value):
+                true_count[index] += 1
+                if true_count[index] == 1:
+                    # The clause becomes satisfied and var is its only true literal.
+                    self.fitness += 1
+                    for literal in self.clauses[index]:
+                        make[abs(literal) - 1] -= 1
+                        changed.append(abs(literal) - 1)
+                    brk[var] += 1
+                elif true_count[index] == 2:
+                    # Var joins a sole true literal, which is no longer critical.
+                    for literal in self.clauses[index]:
+                        other = abs(literal) - 1
+                        if other != var and self.solution[other] == (literal > 0):
+                            brk[other] -= 1
+                            changed.append(other)
+                            break
+            else:
+                true_count[index] -= 1
+                if true_count[index] == 0:
+                    self.fitness -= 1
+                    for literal in self.clauses[index]:
+                        make[abs(literal) - 1] += 1
+                        changed.append(abs(literal) - 1)
+                    brk[var] -= 1
+                elif true_count[index] == 1:
+                    other = self._sole_true_var(index)
+                    brk[other] += 1
+                    changed.append(other)
+
+        return changed
@@ -0,0 +1,408 @@
+"""Job specifications and the local queue that runs them on a worker pool.
+
+A job is a dict with the keys below; only ``algorithm`` and ``instance`` are
+required. A job file holds one JSON job per line (blank lines and lines
+starting with ``#`` are ignored).
+
+    algorithm   name registered in `maxsat.algorithms.ALGORITHMS`
+    instance    DIMACS or compiled (.npz) instance path
+    runs        number of independent runs (default 30)
+    seed        root seed of the runs; drawn and reported when omitted
+    params      algorithm parameters overriding the defaults
+    preprocess  simplify the instance first; fitness is still reported on
+                the original clauses
+    reorder     renumber variables and clauses for memory locality first
+                (see `maxsat.reorder`); solutions are reported in the
+                original numbering
+    bound       upper bound method, one of `maxsat.bounds.BOUND_METHODS`; runs
+                report the bound and their gap to it, and algorithms taking a
+                ``target`` hook stop once they reach it (a gap of 0 is a
+                proven optimum). Without preprocessing only; preprocessed
+                searches still stop only when every clause is satisfied
+    results     result store path; runs already stored there are skipped
+    elite_pool  elite solutions each run keeps in a pool shared by all runs
+                of the job (default 0, no sharing); needs an algorithm
+                taking an ``elite`` hook
+    profile     directory to save profiles of each run's search phase in
+                (see `maxsat.profiling`); off by default
+    profile_mode  'both' (default), 'deterministic' or 'sampling'
+
+Every run of a job becomes one task. Tasks are fed to a process pool a few at
+a time, and an event dict is emitted for each one as soon as it completes.
+"""
+import inspect
+import json
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from maxsat import progress
+from maxsat.algorithms import ALGORITHMS, default_params, get_algorithm
+from maxsat.bounds import BOUND_METHODS, upper_bound
+from maxsat.compiled import load_instance
+from maxsat.elite import ElitePool
+from maxsat.preprocess import simplify
+from maxsat.profiling import PROFILE_MODES, profile_run
+from maxsat.results import ResultStore, pack_assignment
+from maxsat.rng import RandomStreams
+
+JOB_DEFAULTS = {
+    'runs': 30,
+    'seed': None,
+    'params': {},
+    'preprocess': False,
+    'reorder': False,
+    'bound': None,
+    'results': None,
+    'elite_pool': 0,
+    'profile': None,
+    'profile_mode': 'both',
+}
+
+# Tasks queued per worker beyond the one it is running.
+QUEUE_DEPTH = 2
+
+# Instances already loaded by this process, keyed by (path, preprocess, reorder).
+_instances = {}
+
+# Upper bounds already computed by this process, keyed by (path, method).
+_bounds = {}
+
+# Elite pools this process has attached to, keyed by shared memory name.
+_pools = {}
+
+
+def normalise_job(spec):
+    """Validates a job spec and fills in the defaults.
+
+    Raises:
+        ValueError: If the spec names an unknown key, algorithm or parameter,
+            or an instance that does not exist.
+    """
+    unknown = set(spec) - set(JOB_DEFAULTS) - {'algorithm', 'instance'}
+    if unknown:
+        raise ValueError(f"unknown job keys: {', '.join(sorted(unknown))}")
+    for key in ('algorithm', 'instance'):
+        if key not in spec:
+            raise ValueError(f"job is missing {key!r}")
+    if spec['algorithm'] not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {spec['algorithm']!r}; choose from {', '.join(ALGORITHMS)}")
+    if not os.path.exists(spec['instance']):
+        raise ValueError(f"instance {spec['instance']!r} does not exist")
+
+    job = dict(JOB_DEFAULTS, **spec)
+    unknown = set(job['params']) - set(default_params(job['algorithm']))
+    if unknown:
+        raise ValueError(f"{job['algorithm']} has no parameters {', '.join(sorted(unknown))}")
+    if job['runs'] < 1:
+        raise ValueError("runs must be at least 1")
+    if job['elite_pool'] and 'elite' not in inspect.signature(get_algorithm(job['algorithm'])).parameters:
+        raise ValueError(f"{job['algorithm']} cannot share an elite pool")
+    if job['bound'] is not None and job['bound'] not in BOUND_METHODS:
+        raise ValueError(f"bound must be one of {', '.join(BOUND_METHODS)}")
+    if job['profile_mode'] not in PROFILE_MODES:
+        raise ValueError(f"profile_mode must be one of {', '.join(PROFILE_MODES)}")
+    return job
+
+
+def read_job_file(filename):
+    """Reads and validates the jobs of a job file."""
+    jobs = []
+    with open(filename) as file:
+        for line_number, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                jobs.append(normalise_job(json.loads(line)))
+            except ValueError as error:
+                raise ValueError(f"{filename}:{line_number}: {error}") from None
+    return jobs
+
+
+def load(instance, preprocess, reorder=False):
+    """Returns (num_vars, clauses, reduction) for an instance, cached per process.
+
+    The reduction is the simplified and/or reordered instance that is searched
+    instead, or None.
+    """
+    key = (instance, preprocess, reorder)
+    if key not in _instances:
+        num_vars, clauses = load_instance(instance)
+        reduction = simplify(num_vars, clauses) if preprocess else None
+        if reorder:
+            from maxsat.reorder import reorder as reorder_instance
+
+            reduction = reorder_instance(num_vars, clauses, reduction)
+        _instances[key] = (num_vars, clauses, reduction)
+    return _instances[key]
+
+
+def instance_bound(instance, num_vars, clauses, method):
+    """Returns the upper bound of an instance's original clauses, cached per process."""
+    key = (instance, method)
+    if key not in _bounds:
+        _bounds[key] = upper_bound(num_vars, clauses, method)
+    return _bounds[key]
+
+
+def _create_pool(job):
+    num_vars, _, reduction = load(job['instance'], job['preprocess'], job['reorder'])
+    if reduction is not None:
+        num_vars = reduction.num_vars
+    return ElitePool.create(num_vars, job['runs'], job['elite_pool'])
+
+
+def run_task(job, run, elite_name=None, job_index=0):
+    """Runs one run of a job and returns its result record.
+
+    Args:
+        job: A normalised job spec.
+        run: Index of the run.
+        elite_name: Shared memory name of the job's elite pool, if it has one.
+        job_index: Position of the job in its batch, for progress reports.
+    """
+    num_vars, clauses, reduction = load(job['instance'], job['preprocess'], job['reorder'])
+    rng = RandomStreams(job['seed']).stream(run)
+    algorithm = get_algorithm(job['algorithm'])
+    hooks = {}
+    if elite_name is not None:
+        if elite_name not in _pools:
+            _pools[elite_name] = ElitePool.attach(elite_name)
+        hooks['elite'] = _pools[elite_name].writer(run)
+    bound = None
+    if job['bound'] is not None:
+        bound = instance_bound(job['instance'], num_vars, clauses, job['bound'])
+        # Reordering keeps every clause, so the bound holds for the searched
+        # instance too; preprocessing does not preserve the optimum.
+        if not job['preprocess'] and 'target' in inspect.signature(algorithm).parameters:
+            hooks['target'] = bound
+
+    budget = dict(default_params(job['algorithm']), **job['params']).get('max_evaluations')
+    if job['profile'] is None:
+        profiler = nullcontext()
+    else:
+        profiler = profile_run(job['profile'], f"job{job_index}-{job['algorithm']}-run{run}", job['profile_mode'])
+
+    progress.begin_run(job_index, run, budget)
+    start_time = time.time()
+    try:
+        with profiler as profile:
+            if reduction is None:
+                result = algorithm(clauses, num_vars, rng, **job['params'], **hooks)
+            else:
+                result = algorithm(reduction.clauses, reduction.num_vars, rng, **job['params'], **hooks)
+        if reduction is None:
+            best_solution = result['best_solution']
+        else:
+            best_solution = reduction.reconstruct(result['best_solution'])
+            result['best_fitness'] = reduction.evaluate(result['best_solution'])
+    finally:
+        progress.end_run()
+    time_taken = time.time() - start_time
+
+    metrics = {
+        'best_fitness': result['best_fitness'],
+        'num_clauses': len(clauses),
+        'evaluations': result['evaluations'],
+        'time': time_taken,
+    }
+    if bound is not None:
+        metrics['upper_bound'] = bound
+        metrics['gap'] = bound - result['best_fitness']
+    for key in ('total_evaluations', 'cache', 'elite'):
+        if key in result:
+            metrics[key] = result[key]
+
+    record = {
+        'algorithm': job['algorithm'],
+        'instance': job['instance'],
+        'params': job['params'],
+        'preprocess': job['preprocess'],
+        'run': run,
+        'seed': rng.seed_info(),
+        'best_solution': pack_assignment(best_solution),
+        'metrics': metrics,
+        'trace': result.get('trace', []),
+    }
+    if job['reorder']:
+        record['reorder'] = True
+    if job['bound'] is not None:
+        record['bound'] = job['bound']
+    if job['elite_pool']:
+        record['elite_pool'] = job['elite_pool']
+    if profile is not None:
+        record['profile'] = profile
+    return record
+
+
+def _stored_runs(job):
+    """Returns the runs of `job` already in its result store, fixing its seed if needed."""
+    if job['results'] is None:
+        return {}
+    stored = ResultStore(job['results']).completed(
+        algorithm=job['algorithm'], instance=job['instance'], params=job['params'], preprocess=job['preprocess'],
+        reorder=job['reorder'] or None, bound=job['bound'], elite_pool=job['elite_pool'] or None)
+    if job['seed'] is None and stored:
+        # A resumed job keeps the root seed of the runs already stored.
+        job['seed'] = next(iter(stored.values()))['seed']['entropy']
+    return {run: record for run, record in stored.items() if record['seed']['entropy'] == job['seed']}
+
+
+def _summary(index, job, records, failed):
+    fitness = [record['metrics']['best_fitness'] for record in records]
+    return {
+        'event': 'summary',
+        'job': index,
+        'algorithm': job['algorithm'],
+        'instance': job['instance'],
+        'seed': job['seed'],
+        'runs': len(records),
+        'failed': failed,
+        'max_fitness': max(fitness, default=None),
+        'mean_fitness': float(np.mean(fitness)) if fitness else None,
+        'mean_evaluations': float(np.mean([record['metrics']['evaluations'] for record in records])) if records else None,
+        'mean_time': float(np.mean([record['metrics']['time'] for record in records])) if records else None,
+    }
+
+
+class Batch:
+    """Bookkeeping of the runs of a list of jobs.
+
+    Creating a batch resumes every job from its result store (emitting a
+    skip event per stored run) and draws the seeds that are missing; the
+    runs left to do are in `pending` as (job index, run) pairs.
+
+    Args:
+        jobs: Normalised job specs (see `normalise_job`).
+        emit: Called with the skip, run, error, profile and summary events.
+    """
+
+    def __init__(self, jobs, emit):
+        self.jobs = jobs
+        self.emit = emit
+        self.records = [{} for _ in jobs]
+        self.failed = [0] * len(jobs)
+        self.remaining = [job['runs'] for job in jobs]
+        self.pending = deque()
+
+        for index, job in enumerate(jobs):
+            stored = _stored_runs(job)
+            if job['seed'] is None:
+                job['seed'] = RandomStreams().entropy
+            for run in range(job['runs']):
+                if run in stored:
+                    self.records[index][run] = stored[run]
+                    self.remaining[index] -= 1
+                    emit({'event': 'skip', 'job': index, 'run': run})
+                else:
+                    self.pending.append((index, run))
+            if not self.remaining[index]:
+                emit(_summary(index, job, list(self.records[index].values()), 0))
+
+    def completed(self):
+        """Returns the number of runs with a record."""
+        return sum(len(job_records) for job_records in self.records)
+
+    def finish(self, index, run, outcome):
+        """Records the outcome of a run: its record, or the exception it raised."""
+        job = self.jobs[index]
+        emit = self.emit
+        if isinstance(outcome, BaseException):
+            self.failed[index] += 1
+            emit({'event': 'error', 'job': index, 'run': run, 'error': f"{type(outcome).__name__}: {outcome}"})
+        else:
+            self.records[index][run] = outcome
+            if job['results'] is not None:
+                ResultStore(job['results']).append(outcome)
+            emit({'event': 'run', 'job': index, 'run': run, 'seed': outcome['seed'], **outcome['metrics']})
+            if 'profile' in outcome:
+                emit({'event': 'profile', 'job': index, 'run': run, **outcome['profile']})
+        self.remaining[index] -= 1
+        if not self.remaining[index]:
+            ordered = [self.records[index][run] for run in sorted(self.records[index])]
+            emit(_summary(index, job, ordered, self.failed[index]))
+
+    def results(self):
+        """Returns the records of each job (in run order) and the number of failed runs."""
+        ordered = [[job_records[run] for run in sorted(job_records)] for job_records in self.records]
+        return ordered, sum(self.failed)
+
+
+def run_jobs(jobs, workers=1, emit=print, metrics=None):
+    """Runs every run of every job on a pool of `workers` processes.
+
+    Args:
+        jobs: Normalised job specs (see `normalise_job`).
+        workers: Number of worker processes; 1 runs everything in this process.
+        emit: Called with an event dict whenever a run is started (or queued
+            to the pool), finishes, fails or is skipped as already stored,
+            and with a summary event once all runs of a job are done.
+        metrics: A `maxsat.metrics.MetricsServer` for `workers` workers to
+            publish live progress and queue depth to.
+
+    Returns:
+        A tuple of the records of each job (in run order) and the number of
+        runs that failed.
+    """
+    batch = Batch(jobs, emit)
+    pending = batch.pending
+    pools = [_create_pool(job) if remaining and job['elite_pool'] else None
+             for job, remaining in zip(jobs, batch.remaining)]
+
+    def task(index, run):
+        pool = pools[index]
+        return jobs[index], run, pool.name if pool is not None else None, index
+
+    def update_queue(in_flight):
+        if metrics is not None:
+            running = min(in_flight, workers)
+            metrics.queue = {'pending': len(pending) + in_flight - running, 'running': running,
+                             'completed': batch.completed(), 'failed': sum(batch.failed)}
+
+    try:
+        if workers == 1:
+            if metrics is not None:
+                progress.attach(metrics.board)
+            while pending:
+                index, run = pending.popleft()
+                update_queue(1)
+                emit({'event': 'start', 'job': index, 'run': run})
+                try:
+                    outcome = run_task(*task(index, run))
+                except Exception as error:
+                    outcome = error
+                batch.finish(index, run, outcome)
+            update_queue(0)
+        else:
+            board = (metrics.board,) if metrics is not None else ()
+            with ProcessPoolExecutor(max_workers=workers, initializer=progress.attach if board else None,
+                                     initargs=board) as executor:
+                in_flight = {}
+                while pending or in_flight:
+                    while pending and len(in_flight) < workers * QUEUE_DEPTH:
+                        index, run = pending.popleft()
+                        in_flight[executor.submit(run_task, *task(index, run))] = (index, run)
+                        emit({'event': 'queued', 'job': index, 'run': run})
+                    update_queue(len(in_flight))
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, run = in_flight.pop(future)
+                        error = future.exception()
+                        batch.finish(index, run, error if error is not None else future.result())
+                update_queue(0)
+    finally:
+        if workers == 1 and metrics is not None:
+            progress.detach()
+        for pool in pools:
+            if pool is not None:
+                attached = _pools.pop(pool.name, None)
+                if attached is not None:
+                    attached.close()
+                pool.unlink()
+
+    return batch.results()
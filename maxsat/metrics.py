@@ -0,0 +1,147 @@
+"""Local HTTP endpoint serving live metrics of a batch.
+
+A sampler thread copies the `maxsat.progress.ProgressBoard` every `interval`
+seconds and derives rates from consecutive samples; the HTTP handlers only
+serve the latest sample, so neither the searches nor the job queue ever wait
+on a client. ``GET /metrics`` returns JSON:
+
+    queue     pending, running, completed and failed runs
+    workers   per worker: pid, job, run, evaluations, evaluations_per_s,
+              best_fitness, restarts, budget_used (evaluations / the run's
+              max_evaluations) and run_time
+    totals    evaluations and evaluations_per_s over all workers
+
+The server listens on a TCP port of 127.0.0.1 or on a Unix socket
+(``curl --unix-socket PATH http://localhost/metrics``).
+"""
+import json
+import os
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from maxsat.progress import ProgressBoard
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = json.dumps(self.server.metrics.snapshot()).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class MetricsServer:
+    """Serves the progress of `workers` worker processes.
+
+    Args:
+        workers: Number of worker processes (rows of the board).
+        port: TCP port on 127.0.0.1; 0 picks a free one.
+        socket_path: Unix socket path, used instead of a port.
+        interval: Seconds between samples.
+    """
+
+    def __init__(self, workers, port=None, socket_path=None, interval=1.0):
+        self.board = ProgressBoard(workers)
+        self.interval = interval
+        self.queue = {'pending': 0, 'running': 0, 'completed': 0, 'failed': 0}
+        self.started = time.time()
+        self._previous = {}
+        self._snapshot = self._sample()
+        self._stop = threading.Event()
+
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.server = _UnixHTTPServer(socket_path, _Handler)
+            self.address = f"unix:{socket_path}"
+        else:
+            self.server = ThreadingHTTPServer(('127.0.0.1', port or 0), _Handler)
+            self.address = f"http://127.0.0.1:{self.server.server_address[1]}/metrics"
+        self.server.metrics = self
+        self.socket_path = socket_path
+        self._threads = [
+            threading.Thread(target=self.server.serve_forever, name='metrics-server', daemon=True),
+            threading.Thread(target=self._run_sampler, name='metrics-sampler', daemon=True),
+        ]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        self.server.shutdown()
+        self.server.server_close()
+        if self.socket_path is not None and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def snapshot(self):
+        """Returns the latest sample."""
+        return self._snapshot
+
+    def _run_sampler(self):
+        while not self._stop.wait(self.interval):
+            self._snapshot = self._sample()
+
+    def _sample(self):
+        now = time.time()
+        workers = []
+        previous = {}
+        total_rate = 0.0
+        total_evaluations = 0
+        for row in self.board.rows():
+            running = row['job'] >= 0
+            key = (row['pid'], row['job'], row['run'])
+            evaluations = row['evaluations'] if running else 0
+            last = self._previous.get(row['pid'])
+            if not running:
+                rate = 0.0
+            elif last is not None and last[0] == key and now > last[1]:
+                rate = (evaluations - last[2]) / (now - last[1])
+            else:
+                rate = evaluations / max(now - row['started'], 1e-9)
+            previous[row['pid']] = (key, now, evaluations)
+            total_rate += rate
+            total_evaluations += row['evaluations_done'] + evaluations
+            workers.append({
+                'pid': int(row['pid']),
+                'job': int(row['job']) if running else None,
+                'run': int(row['run']) if running else None,
+                'evaluations': int(evaluations),
+                'evaluations_per_s': rate,
+                'best_fitness': int(row['best_fitness']) if running and row['best_fitness'] >= 0 else None,
+                'restarts': int(row['restarts']) if running else 0,
+                'budget_used': evaluations / row['budget'] if running and row['budget'] else None,
+                'run_time': now - row['started'] if running else None,
+                'runs_done': int(row['runs_done']),
+            })
+        self._previous = previous
+        return {
+            'time': now,
+            'uptime': now - self.started,
+            'queue': dict(self.queue),
+            'workers': workers,
+            'totals': {'evaluations': int(total_evaluations), 'evaluations_per_s': total_rate},
+        }
@@ -0,0 +1,181 @@
+"""Simplification of CNF instances before local search.
+
+`simplify` applies unit propagation, pure-literal elimination, subsumption and
+duplicate-clause removal until nothing changes, then renumbers the surviving
+variables densely. Pure literals never cost a clause, but unit propagation and
+subsumption only preserve satisfiability (which is what the satisfiable uf*
+instances need), not the MAXSAT optimum in general. Solutions of the reduced
+instance are therefore always scored on the original clauses through
+`Reduction.evaluate`.
+
+Run as ``python -m maxsat.preprocess input.cnf output.cnf`` to write the
+reduced instance and its variable mapping (``output.cnf.map.json``).
+"""
+import argparse
+import json
+
+from maxsat.dimacs import read_dimacs, write_dimacs
+from maxsat.fitness import evaluate_fitness
+
+
+class Reduction:
+    """A reduced instance and the mapping back to the original variables.
+
+    Attributes:
+        num_vars: Number of variables of the reduced instance.
+        clauses: Clauses of the reduced instance, over variables 1..num_vars.
+        fixed: Original variables set by preprocessing, mapped to 0/1.
+        variables: variables[i] is the original number of reduced variable i + 1.
+        conflicts: Clauses falsified while propagating units.
+    """
+
+    def __init__(self, original_num_vars, original_clauses, clauses, fixed, variables, conflicts):
+        self.original_num_vars = original_num_vars
+        self.original_clauses = original_clauses
+        self.num_vars = len(variables)
+        self.clauses = clauses
+        self.fixed = fixed
+        self.variables = variables
+        self.conflicts = conflicts
+
+    def reconstruct(self, solution):
+        """Extends an assignment of the reduced instance to the original variables.
+
+        Variables that preprocessing neither fixed nor kept occur in no clause
+        and are set to 0.
+        """
+        full = [0] * self.original_num_vars
+        for var, value in self.fixed.items():
+            full[var - 1] = value
+        for index, var in enumerate(self.variables):
+            full[var - 1] = int(bool(solution[index]))
+        return full
+
+    def evaluate(self, solution):
+        """Returns the number of original clauses satisfied by a reduced solution."""
+        return evaluate_fitness(self.reconstruct(solution), self.original_clauses)
+
+    def mapping(self):
+        """Returns the JSON-serialisable mapping back to the original instance."""
+        return {
+            'num_vars': self.original_num_vars,
+            'fixed': {str(var): value for var, value in sorted(self.fixed.items())},
+            'variables': self.variables,
+        }
+
+
+def simplify(num_vars, clauses, unit_propagation=True, pure_literals=True, subsumption=True):
+    """Simplifies a formula until no enabled rule applies.
+
+    Tautologies, repeated literals and duplicate clauses are always removed.
+
+    Args:
+        num_vars: The number of variables.
+        clauses: A list of clauses.
+        unit_propagation: Fix the literal of every unit clause and propagate it.
+        pure_literals: Fix variables that occur with a single polarity.
+        subsumption: Remove clauses that are supersets of another clause.
+
+    Returns:
+        A `Reduction`.
+    """
+
+    live = []
+    seen = set()
+    for clause in clauses:
+        literals = frozenset(clause)
+        if literals in seen or any(-literal in literals for literal in literals):
+            continue
+        seen.add(literals)
+        live.append(set(literals))
+
+    occurs = {}
+    for clause_id, clause in enumerate(live):
+        for literal in clause:
+            occurs.setdefault(literal, set()).add(clause_id)
+
+    fixed = {}
+    conflicts = 0
+    units = [clause_id for clause_id, clause in enumerate(live) if len(clause) == 1]
+
+    def remove_clause(clause_id):
+        for literal in live[clause_id]:
+            occurs[literal].discard(clause_id)
+        live[clause_id] = None
+
+    def assign(literal):
+        nonlocal conflicts
+        fixed[abs(literal)] = int(literal > 0)
+        for clause_id in list(occurs.get(literal, ())):
+            remove_clause(clause_id)
+        for clause_id in list(occurs.get(-literal, ())):
+            clause = live[clause_id]
+            clause.discard(-literal)
+            occurs[-literal].discard(clause_id)
+            if not clause:
+                conflicts += 1
+                live[clause_id] = None
+            elif len(clause) == 1:
+                units.append(clause_id)
+
+    changed = True
+    while changed:
+        changed = False
+
+        if unit_propagation:
+            while units:
+                clause_id = units.pop()
+                if live[clause_id] is not None and len(live[clause_id]) == 1:
+                    assign(next(iter(live[clause_id])))
+                    changed = True
+        units.clear()
+
+        if pure_literals:
+            for literal in list(occurs):
+                if occurs[literal] and not occurs.get(-literal) and abs(literal) not in fixed:
+                    assign(literal)
+                    changed = True
+
+        if subsumption:
+            order = sorted((clause_id for clause_id, clause in enumerate(live) if clause is not None),
+                           key=lambda clause_id: len(live[clause_id]))
+            for clause_id in order:
+                clause = live[clause_id]
+                if clause is None:
+                    continue
+                literal = min(clause, key=lambda literal: len(occurs[literal]))
+                for other_id in list(occurs[literal]):
+                    other = live[other_id]
+                    if other_id != clause_id and len(other) >= len(clause) and clause <= other:
+                        remove_clause(other_id)
+                        changed = True
+
+    remaining = [clause for clause in live if clause is not None]
+    variables = sorted({abs(literal) for clause in remaining for literal in clause})
+    renumber = {var: index + 1 for index, var in enumerate(variables)}
+    reduced = [
+        [renumber[abs(literal)] if literal > 0 else -renumber[abs(literal)] for literal in sorted(clause, key=abs)]
+        for clause in remaining
+    ]
+    return Reduction(num_vars, clauses, reduced, fixed, variables, conflicts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simplify a DIMACS instance before local search.")
+    parser.add_argument('input', help="DIMACS file to simplify")
+    parser.add_argument('output', help="where to write the reduced DIMACS file")
+    args = parser.parse_args(argv)
+
+    num_vars, clauses = read_dimacs(args.input)
+    reduction = simplify(num_vars, clauses)
+
+    write_dimacs(args.output, reduction.num_vars, reduction.clauses, comments=[f"simplified from {args.input}"])
+    with open(args.output + '.map.json', 'w') as file:
+        json.dump(reduction.mapping(), file)
+
+    print(f"Variables: {num_vars} -> {reduction.num_vars} ({len(reduction.fixed)} fixed)")
+    print(f"Clauses: {len(clauses)} -> {len(reduction.clauses)} ({reduction.conflicts} falsified by propagation)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Profiles of the search phase of a run.
+
+`profile_run` wraps only the algorithm call of a run, so instance parsing,
+preprocessing and plotting stay out of the profiles. It can collect two
+profiles:
+
+    deterministic  cProfile; saved as ``<name>.prof`` (pstats format, read by
+                   snakeviz, gprof2dot or ``python -m pstats``)
+    sampling       the searching thread's stack every `interval` seconds,
+                   taken from a background thread; saved as
+                   ``<name>.collapsed`` (one ``frame;frame;... count`` line
+                   per stack, read by flamegraph.pl, speedscope or inferno)
+
+cProfile slows down call-heavy code unevenly. Sampling alone ('sampling'
+mode) gives the truer picture of where wall time goes.
+"""
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+PROFILE_MODES = ('both', 'deterministic', 'sampling')
+
+
+def _frame_label(code):
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples the stack of the thread that calls `start` from a background thread.
+
+    Args:
+        interval: Seconds between samples.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def write_collapsed(self, path):
+        """Writes the samples in the collapsed-stack format of flame graph tools."""
+        with open(path, 'w') as file:
+            for stack, count in self.samples.most_common():
+                file.write(f"{stack} {count}\n")
+
+    def top(self, n):
+        """Returns the `n` functions seen most often at the top of the stack."""
+        own = Counter()
+        for stack, count in self.samples.items():
+            own[stack.rsplit(';', 1)[-1]] += count
+        total = sum(own.values())
+        return [{'function': function, 'samples': count, 'fraction': count / total}
+                for function, count in own.most_common(n)]
+
+
+def top_functions(profile, n):
+    """Returns the `n` functions of a cProfile profile with the most own time.
+
+    Since Python 3.12 cProfile sees every thread, so the sampling thread's
+    own functions are left out.
+    """
+    stats = pstats.Stats(profile)
+    rows = [item for item in stats.stats.items() if item[0][0] not in (__file__, threading.__file__)]
+    rows = sorted(rows, key=lambda item: item[1][2], reverse=True)[:n]
+    return [{
+        'function': f"{name} ({os.path.basename(filename)}:{line})",
+        'calls': calls,
+        'tottime': tottime,
+        'cumtime': cumtime,
+    } for (filename, line, name), (_, calls, tottime, cumtime, _) in rows]
+
+
+@contextmanager
+def profile_run(directory, name, mode='both', top=10, interval=0.005):
+    """Profiles the body of the `with` block.
+
+    Args:
+        directory: Where the profile files are saved; created if missing.
+        name: File name stem of this run's profiles.
+        mode: One of `PROFILE_MODES`.
+        top: Number of functions in the summary.
+        interval: Seconds between stack samples.
+
+    Yields:
+        A dict that, once the block exits, holds the saved ``files`` and the
+        ``top`` functions (by own time under cProfile, else by samples).
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"unknown profile mode {mode!r}; choose from {', '.join(PROFILE_MODES)}")
+    os.makedirs(directory, exist_ok=True)
+    report = {'files': [], 'top': []}
+    deterministic = cProfile.Profile() if mode != 'sampling' else None
+    sampling = SamplingProfiler(interval) if mode != 'deterministic' else None
+
+    if sampling is not None:
+        sampling.start()
+    if deterministic is not None:
+        deterministic.enable()
+    try:
+        yield report
+    finally:
+        if deterministic is not None:
+            deterministic.disable()
+        if sampling is not None:
+            sampling.stop()
+
+        if deterministic is not None:
+            path = os.path.join(directory, f"{name}.prof")
+            deterministic.dump_stats(path)
+            report['files'].append(path)
+            report['top'] = top_functions(deterministic, top)
+        if sampling is not None:
+            path = os.path.join(directory, f"{name}.collapsed")
+            sampling.write_collapsed(path)
+            report['files'].append(path)
+            if deterministic is None:
+                report['top'] = sampling.top(top)
@@ -0,0 +1,123 @@
+"""Live progress counters published by running searches.
+
+A `ProgressBoard` is a block of shared doubles with one row per worker
+process. A worker claims its row once, when it starts. After that the search
+loops call `report`, usually once per flip. It writes the row only when the
+best fitness changes or every `REPORT_INTERVAL` calls, so most calls cost a
+counter increment: no lock, no system call, and nothing at all when this
+process has no row. A reader (see `maxsat.metrics`) copies the board whenever it likes. Fields are
+written one at a time, so a copy may mix two consecutive reports of a worker,
+which is harmless for monitoring.
+"""
+import os
+import time
+from multiprocessing import RawArray, Value
+
+FIELDS = ('pid', 'job', 'run', 'started', 'updated', 'evaluations', 'best_fitness', 'restarts', 'budget',
+          'runs_done', 'evaluations_done')
+PID, JOB, RUN, STARTED, UPDATED, EVALUATIONS, BEST_FITNESS, RESTARTS, BUDGET, RUNS_DONE, EVALUATIONS_DONE = range(
+    len(FIELDS))
+
+# Calls of `report` between two writes of the row when the best fitness
+# does not change.
+REPORT_INTERVAL = 256
+
+# This process's row of the board it is attached to.
+_board = None
+_offset = 0
+
+# Calls since the row was last written, the best fitness it holds, and the
+# latest evaluation count reported (written to the row when the run ends).
+_calls = 0
+_best_fitness = None
+_evaluations = 0
+
+
+class ProgressBoard:
+    """Shared progress rows for `workers` processes.
+
+    It has to reach the workers when they are created, e.g. through the
+    initializer of a process pool (see `attach`).
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.values = RawArray('d', workers * len(FIELDS))
+        self.claimed = Value('i', 0)
+
+    def rows(self):
+        """Returns a copy of every claimed row as a dict of its fields."""
+        values = self.values[:]
+        rows = []
+        for row in range(min(self.claimed.value, self.workers)):
+            start = row * len(FIELDS)
+            rows.append(dict(zip(FIELDS, values[start:start + len(FIELDS)])))
+        return rows
+
+
+def attach(board):
+    """Claims a row of `board` for this process; used as a pool initializer."""
+    global _board, _offset
+    with board.claimed.get_lock():
+        row = board.claimed.value
+        board.claimed.value += 1
+    if row >= board.workers:
+        return
+    _board = board.values
+    _offset = row * len(FIELDS)
+    _board[_offset + PID] = os.getpid()
+    _board[_offset + JOB] = -1
+    _board[_offset + RUN] = -1
+
+
+def detach():
+    """Stops this process from publishing progress."""
+    global _board
+    _board = None
+
+
+def begin_run(job, run, budget=None):
+    """Marks the start of run `run` of job `job`; `budget` is its evaluation budget, if any."""
+    global _calls, _best_fitness, _evaluations
+    if _board is None:
+        return
+    _calls = 0
+    _best_fitness = None
+    _evaluations = 0
+    now = time.time()
+    _board[_offset + JOB] = job
+    _board[_offset + RUN] = run
+    _board[_offset + STARTED] = now
+    _board[_offset + UPDATED] = now
+    _board[_offset + EVALUATIONS] = 0
+    _board[_offset + BEST_FITNESS] = -1
+    _board[_offset + RESTARTS] = 0
+    _board[_offset + BUDGET] = budget if budget else 0
+
+
+def end_run():
+    """Marks the end of the current run, folding its evaluations into the totals."""
+    if _board is None:
+        return
+    _board[_offset + RUNS_DONE] += 1
+    _board[_offset + EVALUATIONS_DONE] += _evaluations
+    _board[_offset + EVALUATIONS] = 0
+    _board[_offset + JOB] = -1
+    _board[_offset + RUN] = -1
+
+
+def report(evaluations, best_fitness, restarts=0):
+    """Publishes the progress of the current run; a no-op without a board."""
+    global _calls, _best_fitness, _evaluations
+    if _board is None:
+        return
+    _evaluations = evaluations
+    _calls += 1
+    if _calls < REPORT_INTERVAL and best_fitness == _best_fitness:
+        return
+    _calls = 0
+    _best_fitness = best_fitness
+    _board[_offset + EVALUATIONS] = evaluations
+    _board[_offset + BEST_FITNESS] = best_fitness
+    _board[_offset + RESTARTS] = restarts
+    _board[_offset + UPDATED] = time.time()
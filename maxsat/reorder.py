@@ -0,0 +1,150 @@
+"""Renumbering of variables and clauses for memory locality.
+
+Evaluation walks the clauses in order and reads ``solution[abs(literal) - 1]``
+for each literal. In a uf* file, or a shuffled industrial instance, the
+variables of consecutive clauses are scattered over the whole assignment, so
+on formulas larger than the CPU caches nearly every read misses. `reorder`
+renumbers both with the reverse Cuthill-McKee ordering of the bipartite
+variable-clause incidence graph: a breadth-first order that keeps every
+clause close to its variables. Consecutive clauses then read nearby parts of
+the assignment.
+
+A `Reordering` has the interface of `maxsat.preprocess.Reduction`, so the job
+runner searches the renumbered instance and maps solutions back (and scores
+them on the original clauses) the same way.
+
+Run as ``python -m maxsat.reorder input.cnf output.cnf`` to write the
+reordered instance and its mapping (``output.cnf.map.json``).
+"""
+import argparse
+import json
+
+import numpy as np
+
+from maxsat.compiled import compile_clauses, decompile
+from maxsat.dimacs import read_dimacs, write_dimacs
+from maxsat.fitness import evaluate_fitness
+
+
+class Reordering:
+    """A renumbered instance and the mapping back to the original.
+
+    Attributes:
+        num_vars: Number of variables.
+        clauses: The clauses in their new order, over the new variable numbers.
+        variables: variables[i] is the number, before reordering, of new
+            variable i + 1.
+        clause_order: clause_order[j] is the index, before reordering, of new
+            clause j.
+        base: The `maxsat.preprocess.Reduction` that was reordered, if any.
+    """
+
+    def __init__(self, original_num_vars, original_clauses, clauses, variables, clause_order, base=None):
+        self.original_num_vars = original_num_vars
+        self.original_clauses = original_clauses
+        self.num_vars = len(variables)
+        self.clauses = clauses
+        self.variables = variables
+        self.clause_order = clause_order
+        self.base = base
+
+    def reconstruct(self, solution):
+        """Returns a solution of the reordered instance in the original numbering."""
+        restored = [0] * len(self.variables)
+        for index, var in enumerate(self.variables):
+            restored[var - 1] = int(bool(solution[index]))
+        return self.base.reconstruct(restored) if self.base is not None else restored
+
+    def evaluate(self, solution):
+        """Returns the number of original clauses satisfied by a reordered solution."""
+        return evaluate_fitness(self.reconstruct(solution), self.original_clauses)
+
+    def mapping(self):
+        """Returns the JSON-serialisable mapping back to the instance before reordering."""
+        return {'variables': self.variables, 'clauses': self.clause_order}
+
+
+def cuthill_mckee_order(num_vars, literals, offsets):
+    """Returns the reverse Cuthill-McKee orders of the variables and the clauses.
+
+    Returns:
+        A tuple of two int arrays: the 0-based variables and the clause
+        indices, in their new order.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+    num_clauses = len(offsets) - 1
+    clause_nodes = num_vars + np.repeat(np.arange(num_clauses, dtype=np.int64), np.diff(offsets))
+    variable_nodes = np.abs(literals).astype(np.int64) - 1
+    size = num_vars + num_clauses
+    incidence = coo_matrix((np.ones(2 * len(literals), dtype=np.int8),
+                            (np.concatenate([variable_nodes, clause_nodes]),
+                             np.concatenate([clause_nodes, variable_nodes]))), shape=(size, size)).tocsr()
+    order = reverse_cuthill_mckee(incidence, symmetric_mode=True)
+    return order[order < num_vars], order[order >= num_vars] - num_vars
+
+
+def reorder(num_vars, clauses, reduction=None):
+    """Renumbers an instance (or its preprocessed `reduction`) for locality.
+
+    Returns:
+        A `Reordering`.
+    """
+    source_vars, source_clauses = (num_vars, clauses) if reduction is None else (reduction.num_vars, reduction.clauses)
+    literals, offsets = compile_clauses(source_clauses)
+    variable_order, clause_order = cuthill_mckee_order(source_vars, literals, offsets)
+
+    renumber = np.empty(source_vars + 1, dtype=np.int32)
+    renumber[variable_order + 1] = np.arange(1, source_vars + 1, dtype=np.int32)
+    renumbered = np.sign(literals) * renumber[np.abs(literals)]
+    lengths = np.diff(offsets)[clause_order]
+    starts = offsets[:-1][clause_order]
+    new_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+    gather = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+    new_clauses = decompile(renumbered[gather].astype(np.int32), new_offsets)
+
+    return Reordering(num_vars, clauses, new_clauses, (variable_order + 1).tolist(), clause_order.tolist(), reduction)
+
+
+def locality(num_vars, clauses):
+    """Returns the mean variable span of a clause and the mean jump between consecutive clauses.
+
+    Both are in variables, as a fraction of `num_vars`; smaller means fewer
+    distinct cache lines per pass over the clauses. Empty clauses read no
+    variables and are left out.
+    """
+    literals, offsets = compile_clauses(clauses)
+    starts = offsets[:-1][offsets[:-1] < offsets[1:]]
+    if not len(starts):
+        return 0.0, 0.0
+    variables = np.abs(literals)
+    low = np.minimum.reduceat(variables, starts)
+    high = np.maximum.reduceat(variables, starts)
+    centres = (low + high) / 2
+    jumps = np.abs(np.diff(centres)).mean() if len(centres) > 1 else 0.0
+    return float((high - low).mean()) / num_vars, float(jumps) / num_vars
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Renumber a DIMACS instance for memory locality.")
+    parser.add_argument('input', help="DIMACS file to reorder")
+    parser.add_argument('output', help="where to write the reordered DIMACS file")
+    args = parser.parse_args(argv)
+
+    num_vars, clauses = read_dimacs(args.input)
+    reordering = reorder(num_vars, clauses)
+
+    write_dimacs(args.output, reordering.num_vars, reordering.clauses, comments=[f"reordered from {args.input}"])
+    with open(args.output + '.map.json', 'w') as file:
+        json.dump(reordering.mapping(), file)
+
+    before = locality(num_vars, clauses)
+    after = locality(reordering.num_vars, reordering.clauses)
+    print(f"Mean clause span: {before[0]:.4f} -> {after[0]:.4f} of the variables")
+    print(f"Mean jump between clauses: {before[1]:.4f} -> {after[1]:.4f} of the variables")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Statistics and plots over the runs of a job.
+
+scipy and matplotlib are imported by the functions that need them, so
+importing this module (or the command line) does not pay for them.
+"""
+import os
+
+
+def kruskal_groups(values, num_groups=3):
+    """Kruskal-Wallis test over consecutive, equally sized groups of runs.
+
+    Returns:
+        A tuple of the H-statistic and p-value, or None when there are fewer
+        runs than groups or all runs reached the same fitness.
+    """
+    group_size = len(values) // num_groups
+    if group_size == 0 or len(set(values)) == 1:
+        return None
+    from scipy.stats import kruskal
+
+    groups = [values[i * group_size:(i + 1) * group_size] for i in range(num_groups)]
+    stat, p_value = kruskal(*groups)
+    return float(stat), float(p_value)
+
+
+def plot_runs(records, directory, name):
+    """Saves fitness-per-run, time-vs-fitness and first-run trace plots as PNG files.
+
+    Returns:
+        The paths of the files written.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    os.makedirs(directory, exist_ok=True)
+    fitness = [record['metrics']['best_fitness'] for record in records]
+    times = [record['metrics']['time'] for record in records]
+    paths = []
+
+    # Plot fitness over runs
+    plt.figure(figsize=(10, 6))
+    plt.plot(range(1, len(fitness) + 1), fitness, marker='o', label="Fitness")
+    plt.xlabel("Run")
+    plt.ylabel("Best Fitness")
+    plt.title("Fitness vs Independent Runs")
+    plt.legend()
+    plt.grid()
+    paths.append(os.path.join(directory, f"{name}-fitness.png"))
+    plt.savefig(paths[-1])
+    plt.close()
+
+    # Plot time vs fitness
+    plt.figure(figsize=(10, 6))
+    plt.scatter(times, fitness, color='blue', label="Runs")
+    plt.xlabel("Time (s)")
+    plt.ylabel("Best Fitness")
+    plt.title("Time vs Fitness")
+    plt.legend()
+    plt.grid()
+    paths.append(os.path.join(directory, f"{name}-time.png"))
+    plt.savefig(paths[-1])
+    plt.close()
+
+    # Plot the search trace of the first run
+    trace = records[0]['trace'] if records else []
+    if trace:
+        plt.figure(figsize=(10, 6))
+        if isinstance(trace[0], list):
+            plt.step([point[0] for point in trace], [point[1] for point in trace], where='post', label="Best fitness")
+            plt.xlabel("Evaluations")
+        else:
+            plt.plot(trace, label="Fitness over Iterations", marker="o")
+            plt.xlabel("Iterations")
+        plt.ylabel("Fitness")
+        plt.title("Fitness vs Iterations")
+        plt.legend()
+        plt.grid()
+        paths.append(os.path.join(directory, f"{name}-trace.png"))
+        plt.savefig(paths[-1])
+        plt.close()
+
+    return paths
@@ -0,0 +1,77 @@
+"""Append-only store of completed runs, used to resume interrupted experiments.
+
+Each completed run is one compact JSON line holding its seed, parameters,
+metrics, trace and best assignment packed to one bit per variable. A record is
+written with a single ``write`` on an ``O_APPEND`` descriptor and fsynced, so
+a run is either fully stored or, if the process dies mid-write, leaves a torn
+last line that readers skip.
+"""
+import base64
+import json
+import os
+
+import numpy as np
+
+
+def pack_assignment(solution):
+    """Packs a 0/1 (or bool) assignment into a base64 string, one bit per variable."""
+    bits = np.packbits(np.asarray(solution, dtype=bool))
+    return base64.b64encode(bits.tobytes()).decode('ascii')
+
+
+def unpack_assignment(packed, num_vars):
+    """Inverse of `pack_assignment`; returns the assignment as a list of 0/1."""
+    bits = np.frombuffer(base64.b64decode(packed), dtype=np.uint8)
+    return np.unpackbits(bits, count=num_vars).tolist()
+
+
+class ResultStore:
+    """A JSON Lines file of run records.
+
+    Args:
+        path: File to append to. It is created on the first append.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def append(self, record):
+        """Durably appends one record (a JSON-serialisable dict)."""
+        data = (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+        fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            # Start on a fresh line if a previous writer was killed mid-record.
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b'\n':
+                data = b'\n' + data
+            # os.write may write only part of the data; a torn record would
+            # read as complete once a later append supplies its newline.
+            while data:
+                data = data[os.write(fd, data):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def records(self):
+        """Returns all complete records in the order they were written."""
+        if not os.path.exists(self.path):
+            return []
+
+        records = []
+        with open(self.path, 'rb') as file:
+            for line in file:
+                if not line.endswith(b'\n'):
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+    def completed(self, **match):
+        """Returns the records whose fields equal all of `match`, keyed by run index."""
+        return {
+            record['run']: record
+            for record in self.records()
+            if all(record.get(key) == value for key, value in match.items())
+        }
@@ -0,0 +1,83 @@
+"""Independent, reproducible random streams for runs and workers.
+
+Every run draws from its own stream derived from a root seed with numpy's
+``SeedSequence``. Stream ``i`` depends only on the root entropy and ``i``, so
+any run of a batch can be replayed on its own, whichever process ran it.
+"""
+import logging
+import random
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class RandomStream:
+    """The random source of a single run.
+
+    Bulk draws (bit vectors, permutations) go through a numpy Generator; the
+    scalar calls made inside the search loops go through a ``random.Random``
+    seeded from the same sequence, which is much cheaper per call.
+    """
+
+    def __init__(self, seed_sequence):
+        self.seed_sequence = seed_sequence
+        self.generator = np.random.default_rng(seed_sequence)
+        state = seed_sequence.generate_state(4, np.uint64)
+        self.random = random.Random(int.from_bytes(state.tobytes(), 'little'))
+
+    @classmethod
+    def from_seed_info(cls, info):
+        """Rebuilds a stream from the dictionary returned by `seed_info`."""
+        return cls(np.random.SeedSequence(info['entropy'], spawn_key=tuple(info['spawn_key'])))
+
+    def seed_info(self):
+        """Returns the JSON-serialisable data needed to replay this stream."""
+        return {
+            'entropy': self.seed_sequence.entropy,
+            'spawn_key': list(self.seed_sequence.spawn_key),
+        }
+
+    def bits(self, n):
+        """Returns a uint8 array of n random 0/1 values."""
+        return self.generator.integers(0, 2, size=n, dtype=np.uint8)
+
+    def bit_list(self, n):
+        """Returns n random 0/1 values as a Python list."""
+        return self.bits(n).tolist()
+
+    def bit_matrix(self, rows, n):
+        """Returns a (rows, n) uint8 array of random 0/1 values."""
+        return self.generator.integers(0, 2, size=(rows, n), dtype=np.uint8)
+
+    def permutation(self, n):
+        """Returns a random permutation of range(n) as an int array."""
+        return self.generator.permutation(n)
+
+    def shuffle(self, items):
+        """Shuffles a Python list in place."""
+        self.random.shuffle(items)
+
+
+class RandomStreams:
+    """Hands out independent `RandomStream` objects from one root seed.
+
+    Args:
+        seed: Root seed. When omitted, fresh OS entropy is drawn and logged so
+            the batch can still be replayed afterwards.
+    """
+
+    def __init__(self, seed=None):
+        self.root = np.random.SeedSequence(seed)
+        self.entropy = self.root.entropy
+        logger.info("root seed %d", self.entropy)
+
+    def stream(self, index):
+        """Returns the stream for run or worker `index`."""
+        stream = RandomStream(np.random.SeedSequence(self.entropy, spawn_key=(index,)))
+        logger.debug("stream %d: %s", index, stream.seed_info())
+        return stream
+
+    def spawn(self, count):
+        """Returns the streams for indices 0 .. count - 1."""
+        return [self.stream(index) for index in range(count)]
@@ -0,0 +1,201 @@
+"""Racing-based parameter tuning (F-Race).
+
+Every configuration of a parameter space is run on the same sequence of
+blocks, one block being one (instance, run) pair, so all configurations of a
+block share an instance and a random stream. After each stage the runs of a
+block are ranked by unsatisfied clauses, ties broken by evaluations to the
+best solution. Once `first_test` blocks are in, a Friedman test over the
+surviving configurations decides whether they differ at all. If they do,
+every configuration whose ranks are significantly worse than those of the
+best (one-sided Wilcoxon signed-rank test) is dropped. The race ends when
+one configuration is left, the blocks run out or the CPU budget (the summed
+time of all runs) is spent.
+
+Runs go through `maxsat.jobs.run_task` on a pool of worker processes. A stage
+takes as many blocks as it needs to keep every worker busy. scipy is only
+imported once a race is ranked.
+"""
+import itertools
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from maxsat.jobs import normalise_job, run_task
+from maxsat.rng import RandomStreams
+
+
+def configurations(space, max_configs=None, seed=None):
+    """Returns the parameter dicts of the grid `space`.
+
+    Args:
+        space: Dict of parameter name to the list of its candidate values.
+        max_configs: If the grid is larger, a uniform sample of this many
+            configurations is returned instead.
+        seed: Seed of the sample.
+    """
+    names = sorted(space)
+    grid = [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+    if max_configs is not None and len(grid) > max_configs:
+        grid = random.Random(seed).sample(grid, max_configs)
+    return grid
+
+
+def _block_costs(records):
+    """Returns the cost of each run of one block; lower is better."""
+    worst = max((record['metrics']['evaluations'] for record in records if record is not None), default=0)
+    costs = []
+    for record in records:
+        if record is None:
+            costs.append(math.inf)
+        else:
+            metrics = record['metrics']
+            unsatisfied = metrics['num_clauses'] - metrics['best_fitness']
+            costs.append(unsatisfied + metrics['evaluations'] / (worst + 1))
+    return costs
+
+
+def eliminate(ranks, alpha=0.05):
+    """Returns the columns of `ranks` that are significantly worse than the best.
+
+    Args:
+        ranks: (blocks, configurations) array of within-block ranks.
+        alpha: Significance level of both tests.
+    """
+    from scipy.stats import friedmanchisquare, wilcoxon
+
+    num_configs = ranks.shape[1]
+    if num_configs < 2:
+        return []
+    if num_configs > 2 and friedmanchisquare(*ranks.T).pvalue >= alpha:
+        return []
+    mean_ranks = ranks.mean(axis=0)
+    best = int(mean_ranks.argmin())
+    losers = []
+    for column in range(num_configs):
+        if column == best or not np.any(ranks[:, column] != ranks[:, best]):
+            continue
+        if wilcoxon(ranks[:, column], ranks[:, best], alternative='greater').pvalue < alpha:
+            losers.append(column)
+    return losers
+
+
+def race(algorithm, instances, space, budget, workers=1, seed=None, fixed=None, max_blocks=60, first_test=5,
+         alpha=0.05, max_configs=None, preprocess=False, emit=print):
+    """Races the configurations of `space` and returns the winner.
+
+    Args:
+        algorithm: Registered algorithm name.
+        instances: Instance paths the blocks cycle through.
+        space: Dict of parameter name to list of values (see `configurations`).
+        budget: CPU seconds all runs together may take.
+        workers: Number of worker processes.
+        seed: Root seed; drawn and reported when omitted.
+        fixed: Parameters shared by every configuration.
+        max_blocks: Most blocks any configuration is run on.
+        first_test: Blocks completed before the first test.
+        alpha: Significance level of the tests.
+        max_configs: Sample this many configurations from a larger grid.
+        preprocess: Simplify the instances first.
+        emit: Called with an event dict after every stage and with the result.
+
+    Returns:
+        A dict with the winning ``params``, its ``mean_fitness`` and ``runs``,
+        the ``survivors`` still in the race, the ``blocks`` run and the CPU
+        time ``spent``.
+
+    Raises:
+        ValueError: If the space is empty or names invalid parameters.
+    """
+    if seed is None:
+        seed = RandomStreams().entropy
+    configs = configurations(space, max_configs, seed)
+    if not configs:
+        raise ValueError("the parameter space is empty")
+    jobs = [
+        [normalise_job({
+            'algorithm': algorithm,
+            'instance': instance,
+            'runs': max_blocks,
+            'seed': seed,
+            'params': dict(fixed or {}, **config),
+            'preprocess': preprocess,
+        }) for instance in instances]
+        for config in configs
+    ]
+    emit({'event': 'race', 'algorithm': algorithm, 'seed': seed, 'configs': len(configs), 'budget': budget})
+
+    alive = list(range(len(configs)))
+    records = {}
+    costs = []
+    spent = 0.0
+    block = 0
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while len(alive) > 1 and block < max_blocks and spent < budget:
+            stage = range(block, min(max_blocks, block + math.ceil(workers / len(alive))))
+            tasks = [(config, b) for b in stage for config in alive]
+            if executor is None:
+                outcomes = [_attempt(*_block_task(jobs[config], b)) for config, b in tasks]
+            else:
+                futures = [executor.submit(_attempt, *_block_task(jobs[config], b)) for config, b in tasks]
+                outcomes = [future.result() for future in futures]
+
+            for (config, b), outcome in zip(tasks, outcomes):
+                if isinstance(outcome, Exception):
+                    emit({'event': 'error', 'params': configs[config], 'block': b,
+                          'error': f"{type(outcome).__name__}: {outcome}"})
+                    outcome = None
+                else:
+                    spent += outcome['metrics']['time']
+                records[config, b] = outcome
+            for b in stage:
+                row = np.full(len(configs), np.nan)
+                row[alive] = _block_costs([records[config, b] for config in alive])
+                costs.append(row)
+            block = stage.stop
+
+            dropped = []
+            if block >= first_test:
+                dropped = [alive[column] for column in eliminate(_ranks(costs, alive), alpha)]
+                alive = [config for config in alive if config not in dropped]
+            emit({'event': 'stage', 'blocks': block, 'alive': len(alive),
+                  'dropped': [configs[config] for config in dropped], 'spent': spent})
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    winner = alive[int(_ranks(costs, alive).mean(axis=0).argmin())] if costs else alive[0]
+    fitness = [record['metrics']['best_fitness'] for (config, _), record in records.items()
+               if config == winner and record is not None]
+    result = {
+        'event': 'tuned',
+        'params': configs[winner],
+        'mean_fitness': float(np.mean(fitness)) if fitness else None,
+        'runs': len(fitness),
+        'survivors': [configs[config] for config in alive],
+        'blocks': block,
+        'spent': spent,
+    }
+    emit(result)
+    return result
+
+
+def _ranks(costs, alive):
+    """Ranks the costs of the `alive` configurations within every block."""
+    from scipy.stats import rankdata
+
+    return np.apply_along_axis(rankdata, 1, np.array(costs)[:, alive])
+
+
+def _block_task(jobs, block):
+    """Returns the (job, run) of a block; blocks cycle through the instances."""
+    return jobs[block % len(jobs)], block // len(jobs)
+
+
+def _attempt(job, run):
+    try:
+        return run_task(job, run)
+    except Exception as error:
+        return error
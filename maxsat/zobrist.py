@@ -0,0 +1,97 @@
+"""Zobrist hashing of assignments and a bounded hash -> fitness cache.
+
+The hash of an assignment is the XOR of a random 64-bit key for every
+variable set to 1, so flipping a variable updates it with one XOR. The cache
+is a fixed-size set-associative table with clock (second-chance) replacement:
+its memory is allocated once from a byte budget and never grows.
+"""
+from array import array
+
+import numpy as np
+
+# Bytes per cache slot: 8 for the key, 8 for the value, 1 reference bit.
+SLOT_BYTES = 17
+WAYS = 4
+
+
+class ZobristTable:
+    """Random 64-bit keys, one per variable.
+
+    The keys come from their own generator rather than the run's stream, so
+    turning caching on does not change the search trajectory.
+    """
+
+    def __init__(self, num_vars, seed=0):
+        generator = np.random.default_rng(seed)
+        self.keys = np.frombuffer(generator.bytes(8 * num_vars), dtype=np.uint64).tolist()
+
+    def hash(self, solution):
+        """Returns the hash of a 0/1 assignment in O(n)."""
+        value = 0
+        for key, bit in zip(self.keys, solution):
+            if bit:
+                value ^= key
+        return value
+
+
+class FitnessCache:
+    """Maps assignment hashes to fitness within a fixed memory budget.
+
+    Args:
+        max_bytes: Memory ceiling of the table.
+    """
+
+    def __init__(self, max_bytes=64 << 20):
+        self.num_sets = max(1, max_bytes // (SLOT_BYTES * WAYS))
+        slots = self.num_sets * WAYS
+        self.keys = array('Q', bytes(8 * slots))
+        self.values = array('q', [-1]) * slots
+        self.referenced = bytearray(slots)
+        self.hands = bytearray(self.num_sets)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns the cached fitness of `key`, or None."""
+        start = (key % self.num_sets) * WAYS
+        for slot in range(start, start + WAYS):
+            if self.keys[slot] == key and self.values[slot] >= 0:
+                self.referenced[slot] = 1
+                self.hits += 1
+                return self.values[slot]
+        self.misses += 1
+        return None
+
+    def put(self, key, fitness):
+        """Stores a fitness, evicting a slot of the set that was not recently used."""
+        set_index = key % self.num_sets
+        start = set_index * WAYS
+        for slot in range(start, start + WAYS):
+            if self.values[slot] < 0 or self.keys[slot] == key:
+                break
+        else:
+            hand = self.hands[set_index]
+            while self.referenced[start + hand]:
+                self.referenced[start + hand] = 0
+                hand = (hand + 1) % WAYS
+            slot = start + hand
+            self.hands[set_index] = (hand + 1) % WAYS
+        self.keys[slot] = key
+        self.values[slot] = fitness
+        self.referenced[slot] = 0
+
+    def stats(self):
+        """Returns hit/miss counters and the table's size."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'capacity': len(self.values),
+            'bytes': len(self.values) * SLOT_BYTES,
+        }
+
+
+def cache_for(cache_mb):
+    """Returns a `FitnessCache` of `cache_mb` megabytes, or None for 0."""
+    return FitnessCache(int(cache_mb * (1 << 20))) if cache_mb else None
@@ -0,0 +1,34 @@
+"""Regression tests for the genetic algorithm.
+
+Run with ``python -m unittest discover tests`` from the repository root.
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maxsat.algorithms.genetic import clone_population, run_ga
+from maxsat.rng import RandomStreams
+
+
+class ZeroWeightSelectionTest(unittest.TestCase):
+    def test_clone_population_draws_uniformly_when_nothing_is_satisfied(self):
+        rng = RandomStreams(1).stream(0)
+        parents = clone_population(2, [2, 2, 2], 5, rng)
+        self.assertEqual(len(parents), 5)
+        self.assertTrue(all(0 <= index < 3 for index in parents))
+
+    def test_empty_clause(self):
+        result = run_ga([[]], 1, RandomStreams(1).stream(0))
+        self.assertEqual(result['best_fitness'], 0)
+        self.assertEqual(result['evaluations'], 1000)
+
+    def test_unsatisfiable_units(self):
+        clauses = [[1], [-1], [2], [-2]]
+        result = run_ga(clauses, 2, RandomStreams(1).stream(0), max_evaluations=200)
+        self.assertEqual(result['best_fitness'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()